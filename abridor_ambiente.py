@@ -1,48 +1,799 @@
+import time
+_IMPORT_T0 = time.perf_counter()  # referência para medir o tempo até a janela ficar pronta
+
 import os
 import subprocess
-import webbrowser
 import json
+import queue
+import shutil
+import sys
+import threading
+import hashlib
+import functools
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait, as_completed
 from pathlib import Path
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, scrolledtext
 from datetime import datetime
 
+# webbrowser, asyncio, argparse, csv e multiprocessing são importados só
+# quando usados, para a janela aparecer o quanto antes
+
 # ==================== CONFIGURAÇÕES ====================
+CONFIG = {
+    "vscode_path": None,  # None = descoberto automaticamente (ou defina o caminho manualmente)
+    "base_projects_dir": str(Path.home() / "Documents" / "Projetos"),
+    "browser": "default",
+    "cache_dir": str(Path.home() / ".abridor_ambiente"),
+    "templates_dir": str(Path.home() / ".abridor_ambiente" / "templates"),  # templates extras
+    "venv_pool_size": 2,  # venvs prontos mantidos por interpretador (0 desativa o pool)
+    "venv_pool_max_age_days": 14,  # venvs mais antigos que isso são descartados
+    "git_initial_commit": False,  # commit inicial com os arquivos do template
+    "extensions_cache_ttl": 24 * 3600,  # validade (s) da lista de extensões instaladas
+    "warm_dependencies": True,  # instala as dependências do template em segundo plano
+    "wheelhouse_max_mb": 2048,  # limite do cache local de wheels (pip)
+    "npm_cache_max_mb": 2048,  # limite do cache offline do npm
+    "warm_build": True,  # compila o projeto novo em segundo plano (C/C++, Java)
+    "build_cache_max_mb": 512,  # limite do cache de saídas de compilação
+    "probe_timeout": 5,  # tempo máximo (s) de cada comando de versão na sondagem
+    "max_subprocesses": 8,  # comandos (git, pip, compiladores...) rodando ao mesmo tempo
+    "terminal_backend": "auto",  # auto, tmux, emulator, windows, macos ou headless
+    "tmux_session": "abridor",  # sessão tmux (e janela do Windows Terminal) compartilhada
+    "docs_mirror": True,  # guarda uma cópia local das páginas de documentação abertas
+    "docs_cache_max_mb": 200,  # limite do espelho de documentação
+    "docs_timeout": 15,  # tempo máximo (s) para baixar cada página
+    "event_interval_ms": 100,  # intervalo mínimo entre eventos agrupados (bytes, progresso)
+}
+
+# ==================== CACHE EM DISCO ====================
+
+def cache_path(name):
+    """Caminho de um arquivo dentro da pasta de cache"""
+    return Path(CONFIG["cache_dir"]) / name
+
+def load_cache(name):
+    """Lê um cache JSON, retornando um dicionário vazio se não existir ou estiver corrompido"""
+    try:
+        data = json.loads(cache_path(name).read_text(encoding='utf-8'))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(name, data):
+    """Grava um cache JSON de forma atômica"""
+    path = cache_path(name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError as e:
+        warn(f"Não foi possível gravar o cache {name}: {e}")
+
+def file_signature(path):
+    """Assinatura (mtime, tamanho) usada para invalidar caches quando um binário muda"""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+# ==================== MEDIÇÃO DE TEMPO (TRACE) ====================
+
+_trace_local = threading.local()
+
+class Span:
+    """Intervalo medido: tempo de parede, tempo em subprocessos e bytes gravados"""
+
+    def __init__(self, name, category, start, args):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.thread = threading.current_thread().name
+        self.tid = threading.get_ident()
+        self.subprocess_s = 0.0
+        self.bytes_written = 0
+        self.args = args
+
+    @property
+    def wall_s(self):
+        return (self.end or time.perf_counter()) - self.start
+
+class Tracer:
+    """Coleta os spans de uma inicialização e exporta em formato Chrome trace e JSONL"""
+
+    def __init__(self, name="launch", **info):
+        self.name = name
+        self.info = info
+        self.spans = []
+        self.events = []  # (instante, ProgressEvent) recebidos do EventBus
+        self.t0 = time.perf_counter()
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, category="function", **args):
+        stack = _span_stack()
+        span = Span(name, category, time.perf_counter(), args)
+        with self._lock:
+            self.spans.append(span)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.remove(span)
+
+    @contextmanager
+    def activate(self):
+        """Faz os spans da thread atual (e das funções instrumentadas) irem para este tracer"""
+        previous = getattr(_trace_local, "tracer", None)
+        _trace_local.tracer, _trace_local.stack = self, []
+        try:
+            yield self
+        finally:
+            _trace_local.tracer, _trace_local.stack = previous, []
+
+    def stages(self):
+        return [span for span in self.spans if span.category == "stage" and span.end]
+    
+    def record_event(self, event):
+        """Assinante do EventBus: processos, bytes, avisos e o "pronto" entram no trace"""
+        if event.kind in ("spawn", "exit", "bytes", "warning", "ready"):
+            with self._lock:
+                self.events.append((time.perf_counter(), event))
+
+    def total_s(self):
+        ends = [span.end for span in self.spans if span.end]
+        return (max(ends) - self.t0) if ends else 0.0
+
+    def breakdown(self):
+        """Resumo de uma linha com a duração de cada etapa"""
+        parts = [f"{span.name} {span.wall_s * 1000:.0f}ms" for span in sorted(self.stages(), key=lambda s: s.start)]
+        return f"⏱️ {self.total_s():.2f}s — " + " · ".join(parts)
+
+    def chrome_trace(self):
+        """Eventos no formato 'Trace Event' (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events, threads = [], {}
+        for span in self.spans:
+            if span.end is None:
+                continue
+            threads[span.tid] = span.thread
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": pid, "tid": span.tid,
+                "ts": round((span.start - self.t0) * 1e6, 1), "dur": round(span.wall_s * 1e6, 1),
+                "args": dict(span.args, subprocess_s=round(span.subprocess_s, 6),
+                             bytes_written=span.bytes_written),
+            })
+        for tid, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_name}})
+        
+        written = {}
+        for when, event in self.events:
+            ts = round((when - self.t0) * 1e6, 1)
+            if event.kind == "bytes":  # contador acumulado por etapa
+                written[event.stage] = written.get(event.stage, 0) + event.data["count"]
+                events.append({"name": "bytes_written", "ph": "C", "pid": pid, "ts": ts,
+                               "args": {str(event.stage): written[event.stage]}})
+            else:
+                label = event.data.get("name") or event.data.get("text") or event.kind
+                events.append({"name": f"{event.kind}: {label}", "cat": event.kind, "ph": "i", "s": "p",
+                               "pid": pid, "tid": 0, "ts": ts, "args": event.to_dict()})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": dict(self.info, name=self.name)}
+
+    def history_record(self):
+        return {
+            "time": self.started_at.isoformat(timespec="seconds"),
+            "name": self.name,
+            **self.info,
+            "total_s": round(self.total_s(), 6),
+            "stages": {span.name: {"wall_s": round(span.wall_s, 6),
+                                   "subprocess_s": round(span.subprocess_s, 6),
+                                   "bytes_written": span.bytes_written}
+                       for span in self.stages()},
+        }
+
+    def save(self, keep=50):
+        """Grava o trace Chrome em traces/ e acrescenta a linha no histórico JSONL"""
+        trace_dir = cache_path("traces")
+        try:
+            trace_dir.mkdir(parents=True, exist_ok=True)
+            trace_file = trace_dir / f"{self.name}-{self.started_at:%Y%m%d-%H%M%S}-{os.getpid()}.json"
+            trace_file.write_text(json.dumps(self.chrome_trace()), encoding='utf-8')
+            with open(cache_path("launch_history.jsonl"), "a", encoding='utf-8') as f:
+                f.write(json.dumps(self.history_record(), ensure_ascii=False) + "\n")
+            
+            for old in sorted(trace_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)[:-keep]:
+                old.unlink()
+            return trace_file
+        except OSError as e:
+            warn(f"Não foi possível gravar o trace: {e}")
+            return None
+
+def _span_stack():
+    if not hasattr(_trace_local, "stack"):
+        _trace_local.stack = []
+    return _trace_local.stack
+
+def active_tracer():
+    return getattr(_trace_local, "tracer", None)
+
+@contextmanager
+def trace_span(name, category="function", **args):
+    """Abre um span no tracer ativo da thread (sem efeito se não houver)"""
+    tracer = active_tracer()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, category, **args) as span:
+        yield span
+
+def traced(func):
+    """Decorador que mede a função no tracer ativo"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with trace_span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def process_uptime():
+    """Segundos desde o início do processo (fora do Linux: desde a importação do módulo)"""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")  # campo 22: starttime
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter() - _IMPORT_T0
+
+def record_subprocess_time(seconds):
+    """Soma tempo de subprocesso aos spans abertos na thread"""
+    for span in _span_stack():
+        span.subprocess_s += seconds
+
+def record_bytes_written(count):
+    """Soma bytes gravados aos spans abertos na thread e emite o evento 'bytes'"""
+    for span in _span_stack():
+        span.bytes_written += count
+    emit_event("bytes", count=count)
+
+# ==================== EVENTOS DE PROGRESSO ====================
+#
+# As etapas e os auxiliares (gravação de arquivos, supervisor de processos,
+# avisos) emitem eventos tipados no EventBus da inicialização em andamento:
+#
+#   stage_start / stage_end   início e fim de cada etapa (status done, error ou skipped)
+#   progress                  texto de andamento da etapa
+#   bytes                     bytes gravados
+#   spawn / exit              processos filhos iniciados e encerrados
+#   warning                   avisos que antes só iam para o console
+#   ready / end               etapas principais concluídas / grafo concluído
+#
+# A interface, o "create" (texto ou --json-events), o daemon e o trace assinam o
+# mesmo fluxo. "bytes" e "progress" são agrupados por etapa: um template com
+# 10 mil arquivos vira alguns eventos por segundo, não 10 mil.
+
+_stage_local = threading.local()
+
+class ProgressEvent:
+    """Evento de progresso: tipo, etapa (ou None), dados e instante (s desde o início)"""
+
+    __slots__ = ("kind", "stage", "data", "time")
+    
+    def __init__(self, kind, stage, data, time_s):
+        self.kind = kind
+        self.stage = stage
+        self.data = data
+        self.time = time_s
+    
+    def to_dict(self):
+        """Formato JSON (linhas do daemon e do --json-events)"""
+        event = {"event": self.kind, "stage": self.stage, "t": round(self.time, 6)}
+        event.update((key, _json_safe(value)) for key, value in self.data.items())
+        return event
+    
+    def __repr__(self):
+        return f"ProgressEvent({self.kind!r}, {self.stage!r}, {self.data!r})"
+
+class EventBus:
+    """Entrega os eventos de uma inicialização aos assinantes, na ordem em que ocorrem
+
+    "bytes" (somados) e "progress" (só o último texto) de uma mesma etapa saem no
+    máximo a cada 'interval' segundos; o restante é entregue na hora, e o fim da
+    etapa entrega antes o que estiver pendente. Um assinante que falha é removido.
+    """
+    COALESCED = ("bytes", "progress")
+    
+    def __init__(self, interval=None):
+        self.interval = CONFIG["event_interval_ms"] / 1000 if interval is None else interval
+        self.t0 = time.perf_counter()
+        self.closed = False
+        self._subscribers = []
+        self._pending = {}  # (tipo, etapa) -> evento agrupado ainda não entregue
+        self._last = {}     # (tipo, etapa) -> instante da última entrega
+        self._timer = None
+        self._lock = threading.RLock()  # assinantes podem emitir (ex.: avisos)
+    
+    def subscribe(self, callback):
+        """Passa a entregar os eventos a 'callback(evento)'; retorna o próprio callback"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+    
+    def emit(self, kind, stage=None, **data):
+        if self.closed:
+            return
+        now = time.perf_counter() - self.t0
+        with self._lock:
+            if kind in self.COALESCED:
+                key = (kind, stage)
+                pending = self._pending.pop(key, None)
+                if kind == "bytes":
+                    data.setdefault("writes", 1)
+                    if pending is not None:
+                        data["count"] += pending.data["count"]
+                        data["writes"] += pending.data["writes"]
+                event = ProgressEvent(kind, stage, data, now)
+                if now - self._last.get(key, -self.interval) < self.interval:
+                    self._pending[key] = event
+                    self._schedule_flush()
+                    return
+                self._last[key] = now
+                self._deliver(event)
+                return
+            
+            if kind == "stage_end":
+                self._flush_stage(stage)
+            elif kind in ("ready", "end"):
+                self.flush()
+            self._deliver(ProgressEvent(kind, stage, data, now))
+    
+    def flush(self):
+        """Entrega todos os eventos agrupados pendentes"""
+        with self._lock:
+            for key in list(self._pending):
+                self._last[key] = time.perf_counter() - self.t0
+                self._deliver(self._pending.pop(key))
+    
+    def close(self):
+        """Entrega o que falta e passa a ignorar novos eventos (ex.: VS Code fechado horas depois)"""
+        with self._lock:
+            self.flush()
+            self.closed = True
+            if self._timer:
+                self._timer.cancel()
+    
+    async def stream(self, until=("end",)):
+        """Gerador assíncrono dos eventos, até um evento de 'until' ou o fechamento
+
+        Assina ao ser iterado pela primeira vez: crie-o antes de iniciar as etapas
+        e comece a iterar logo (ex.: asyncio.create_task).
+        """
+        import asyncio
+        loop = asyncio.get_event_loop()
+        events = asyncio.Queue()
+        callback = self.subscribe(lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event.kind in until:
+                    return
+        finally:
+            self.unsubscribe(callback)
+    
+    def _flush_stage(self, stage):
+        for key in [key for key in self._pending if key[1] == stage]:
+            self._last[key] = time.perf_counter() - self.t0
+            self._deliver(self._pending.pop(key))
+    
+    def _schedule_flush(self):
+        if self._timer is None or not self._timer.is_alive():
+            self._timer = threading.Timer(self.interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _deliver(self, event):
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                self._subscribers.remove(callback)
+                # stderr direto: warn() emitiria outro evento neste mesmo barramento
+                print(f"Aviso: assinante de eventos removido ({e})", file=sys.stderr)
+
+def current_events():
+    """EventBus da etapa em execução na thread (None fora do pipeline)"""
+    return getattr(_stage_local, "events", None)
+
+def current_stage_name():
+    return getattr(_stage_local, "stage", None)
+
+def emit_event(kind, **data):
+    """Emite um evento na etapa em execução na thread (sem efeito fora do pipeline)"""
+    events = getattr(_stage_local, "events", None)
+    if events is not None:
+        events.emit(kind, getattr(_stage_local, "stage", None), **data)
+
+def warn(text):
+    """Mostra um aviso no console e o emite como evento 'warning' da etapa atual"""
+    print(f"Aviso: {text}", file=sys.stderr)
+    emit_event("warning", text=text)
+
+# ==================== SUBPROCESSOS ====================
+#
+# Todo processo filho passa pelo supervisor: comandos que rodam até o fim
+# (run_command) respeitam um limite de simultâneos e o timeout da etapa; programas
+# abertos para o usuário (spawn_process) têm o stderr drenado para o log e são
+# aguardados em segundo plano, sem deixar zumbis.
+
+# Semáforo (compartilhado entre processos no modo lote) que limita quantos
+# subprocessos rodam ao mesmo tempo; None = usa o limite do supervisor
+_subprocess_slots = None
+
+# Interface gráfica ou daemon: só em processos que continuam vivos o trabalho em
+# segundo plano (reabastecer o pool de venvs, espelhar a documentação) tem tempo
+# de terminar. Num "create" avulso, a thread morreria no meio e o filho ficaria órfão.
+_resident_process = False
+
+def mark_resident_process():
+    global _resident_process
+    _resident_process = True
+
+class ChildProcess:
+    """Processo filho acompanhado pelo supervisor"""
+
+    def __init__(self, args, name, timeout=None):
+        self.args = [str(a) for a in args] if isinstance(args, (list, tuple)) else [str(args)]
+        self.name = name or os.path.basename(self.args[0])
+        self.timeout = timeout
+        self.process = None
+        self.started = time.time()
+        self.ended = None
+        self.returncode = None
+        self.state = "running"  # running, exited, failed ou timeout
+        self.stderr_tail = []
+        # O fim de um spawn é visto por outra thread: guarda a etapa que o iniciou
+        self.events, self.stage = current_events(), current_stage_name()
+    
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+    
+    def finish(self, returncode, state=None):
+        self.returncode = returncode
+        self.ended = time.time()
+        self.state = state or ("exited" if returncode == 0 else "failed")
+        self.notify("exit", returncode=returncode, state=self.state, seconds=self.ended - self.started)
+    
+    def notify(self, kind, **data):
+        """Emite 'spawn'/'exit' no EventBus da etapa que iniciou o processo"""
+        if self.events is not None:
+            self.events.emit(kind, self.stage, name=self.name, pid=self.pid, **data)
+    
+    def describe(self):
+        """Texto curto para a interface"""
+        if self.state == "running":
+            return f"⏳ {self.name} ({time.time() - self.started:.0f}s)"
+        if self.state == "timeout":
+            return f"⏱️ {self.name} (tempo esgotado)"
+        return f"❌ {self.name} (código {self.returncode})"
+
+class ProcessSupervisor:
+    """Dono dos processos filhos: limite de simultâneos, timeouts, stderr e reaping"""
+
+    STDERR_TAIL = 20
+    LOG_MAX_BYTES = 1024 * 1024
+    
+    def __init__(self, max_running=8, keep_finished=50):
+        self.slots = threading.BoundedSemaphore(max(1, max_running))
+        self.keep_finished = keep_finished
+        self.children = []
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+    
+    def _register(self, child):
+        with self._lock:
+            self.children.append(child)
+            finished = [c for c in self.children if c.state != "running"]
+            for old in finished[:-self.keep_finished]:
+                self.children.remove(old)
+        return child
+    
+    def log(self, child, line):
+        """Acrescenta uma linha ao log dos processos (processes.log, com rotação)"""
+        path = cache_path("processes.log")
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._log_lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                if path.exists() and path.stat().st_size > self.LOG_MAX_BYTES:
+                    os.replace(path, path.with_name(path.name + ".1"))
+                with open(path, "a", encoding='utf-8') as f:
+                    f.write(f"{stamp} [{child.name} {child.pid or '-'}] {line}\n")
+            except OSError:
+                pass
+    
+    def run(self, cmd, name=None, **kwargs):
+        """subprocess.run dentro do limite de simultâneos (e do timeout recebido)"""
+        child = self._register(ChildProcess(cmd, name, kwargs.get("timeout")))
+        slots = _subprocess_slots or self.slots
+        try:
+            with slots:
+                child.started = time.time()  # sem contar a espera por uma vaga
+                child.notify("spawn", cmd=child.args)
+                result = subprocess.run(cmd, **kwargs)
+        except subprocess.TimeoutExpired:
+            child.finish(None, "timeout")
+            self.log(child, f"tempo esgotado após {child.timeout}s: {' '.join(child.args)}")
+            raise
+        except subprocess.CalledProcessError as e:
+            child.finish(e.returncode)
+            self._log_failure(child, e.stderr)
+            raise
+        except OSError as e:
+            child.finish(None, "failed")
+            self.log(child, f"não foi possível executar: {e}")
+            raise
+        child.finish(result.returncode)
+        if result.returncode != 0:
+            self._log_failure(child, result.stderr)
+        return result
+    
+    def _log_failure(self, child, stderr):
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode(errors="replace")
+        lines = [line for line in (stderr or "").splitlines() if line.strip()]
+        child.stderr_tail = lines[-self.STDERR_TAIL:]
+        self.log(child, f"código {child.returncode}: {' '.join(child.args)}")
+        for line in child.stderr_tail:
+            self.log(child, line)
+    
+    def spawn(self, cmd, name=None, timeout=None, **kwargs):
+        """subprocess.Popen acompanhado: stderr drenado para o log e reaping em segundo plano
+
+        Com 'timeout', o processo é encerrado se ainda estiver rodando depois desse
+        tempo (não use para programas que o usuário deixa abertos).
+        """
+        kwargs.setdefault("stdin", subprocess.DEVNULL)
+        kwargs.setdefault("stdout", subprocess.DEVNULL)
+        kwargs["stderr"] = subprocess.PIPE
+        child = ChildProcess(cmd, name, timeout)
+        try:
+            child.process = subprocess.Popen(cmd, **kwargs)
+        except OSError as e:
+            child.finish(None, "failed")
+            self._register(child)
+            self.log(child, f"não foi possível executar: {e}")
+            raise
+        self._register(child)
+        child.notify("spawn", cmd=child.args)
+        self.log(child, f"iniciado: {' '.join(child.args)}")
+        threading.Thread(target=self._watch, args=(child,), daemon=True).start()
+        return child.process
+    
+    def _watch(self, child):
+        """Lê o stderr sem bloquear o filho e o aguarda até terminar (sem zumbis)"""
+        process = child.process
+        timer = None
+        if child.timeout:
+            timer = threading.Timer(child.timeout, self._expire, args=(child,))
+            timer.daemon = True
+            timer.start()
+        if process.stderr is not None:
+            for raw in iter(process.stderr.readline, b""):
+                line = raw.decode(errors="replace").rstrip()
+                if line:
+                    child.stderr_tail = (child.stderr_tail + [line])[-self.STDERR_TAIL:]
+                    self.log(child, line)
+            process.stderr.close()
+        returncode = process.wait()
+        if timer:
+            timer.cancel()
+        if child.state == "running":
+            child.finish(returncode)
+        self.log(child, f"terminou com código {returncode}")
+    
+    def _expire(self, child):
+        if child.state != "running" or child.process.poll() is not None:
+            return
+        child.finish(None, "timeout")
+        self.log(child, f"tempo esgotado após {child.timeout}s; encerrando")
+        child.process.terminate()
+        try:
+            child.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            child.process.kill()
+    
+    def active(self):
+        """Processos ainda rodando ou que falharam, para mostrar na interface"""
+        with self._lock:
+            return [c for c in self.children if c.state != "exited"]
+
+supervisor = ProcessSupervisor(max_running=CONFIG["max_subprocesses"])
+
+def run_command(cmd, **kwargs):
+    """subprocess.run pelo supervisor, com o timeout da etapa atual como padrão"""
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = current_stage_timeout()
+    start = time.perf_counter()
+    try:
+        return supervisor.run(cmd, **kwargs)
+    finally:
+        record_subprocess_time(time.perf_counter() - start)
+
+def spawn_process(cmd, **kwargs):
+    """Abre um processo que continua rodando (VS Code, terminal) sob o supervisor"""
+    start = time.perf_counter()
+    try:
+        return supervisor.spawn(cmd, **kwargs)
+    finally:
+        record_subprocess_time(time.perf_counter() - start)
+
+# ==================== DETECÇÃO DO VS CODE ====================
+
+VSCODE_CANDIDATES = [
+    r"C:\Program Files\Microsoft VS Code\Code.exe",
+    r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
+    str(Path.home() / "AppData" / "Local" / "Programs" / "Microsoft VS Code" / "Code.exe"),
+    "/usr/share/code/bin/code",
+    "/snap/bin/code",
+    "/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code",
+]
+
+@traced
 def find_vscode_path():
-    """Tenta encontrar o caminho do VS Code automaticamente"""
-    possible_paths = [
-        "code",  # Se estiver no PATH
-        r"C:\Program Files\Microsoft VS Code\Code.exe",
-        r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
-        str(Path.home() / "AppData" / "Local" / "Programs" / "Microsoft VS Code" / "Code.exe"),
-    ]
+    """Tenta encontrar o caminho do VS Code automaticamente
+
+    O resultado fica em cache, associado ao mtime do executável; a busca no PATH
+    e nos caminhos comuns é feita antes de qualquer subprocesso.
+    """
+    cache = load_cache("vscode.json")
+    cached = cache.get("path")
+    if cached:
+        try:
+            if file_signature(cached) == cache.get("signature"):
+                return cached
+        except OSError:
+            pass  # executável removido: refazer a busca
+    
+    found = shutil.which("code")
+    if not found:
+        found = next((path for path in VSCODE_CANDIDATES if Path(path).exists()), None)
+    
+    if found:
+        save_cache("vscode.json", {"path": found, "signature": file_signature(found)})
+        return found
     
-    # Testar se 'code' funciona
+    # Último recurso: 'code' resolvido apenas pelo shell (ex.: atalhos do Windows)
     try:
-        subprocess.run(["code", "--version"], capture_output=True, timeout=2)
+        run_command(["code", "--version"], capture_output=True, timeout=2, check=True)
         return "code"
-    except:
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+_vscode_lock = threading.Lock()
+_vscode_discovered = False
+
+def known_vscode_path():
+    """Caminho do VS Code já conhecido, sem busca nem subprocesso: (caminho, conhecido?)
+
+    Usa a configuração, a descoberta já feita neste processo ou o vscode.json ainda válido.
+    """
+    if CONFIG["vscode_path"] or _vscode_discovered:
+        return CONFIG["vscode_path"], True
+    cache = load_cache("vscode.json")
+    try:
+        if cache.get("path") and file_signature(cache["path"]) == cache.get("signature"):
+            return cache["path"], True
+    except OSError:
         pass
+    return None, False
+
+def get_vscode_path():
+    """Retorna o caminho do VS Code, fazendo a descoberta apenas na primeira chamada"""
+    global _vscode_discovered
+    if CONFIG["vscode_path"] or _vscode_discovered:
+        return CONFIG["vscode_path"]
     
-    # Procurar nos caminhos comuns
-    for path in possible_paths[1:]:
-        if Path(path).exists():
-            return path
-    
-    return None
+    with _vscode_lock:
+        if not _vscode_discovered:
+            CONFIG["vscode_path"] = CONFIG["vscode_path"] or find_vscode_path()
+            _vscode_discovered = True
+    return CONFIG["vscode_path"]
 
-CONFIG = {
-    "vscode_path": find_vscode_path(),
-    "base_projects_dir": str(Path.home() / "Documents" / "Projetos"),
-    "browser": "default",
-}
+def start_vscode_discovery():
+    """Descobre o VS Code em uma thread de segundo plano"""
+    thread = threading.Thread(target=get_vscode_path, daemon=True)
+    thread.start()
+    return thread
 
 # ==================== TEMPLATES DE LINGUAGENS ====================
 LANGUAGES = {
     "JavaScript": {
         "color": "#f7df1e",
         "icon": "🟨",
-        "files": {
+        "urls": [
+            "https://developer.mozilla.org/pt-BR/docs/Web/JavaScript",
+            "https://www.npmjs.com/",
+            "https://github.com"
+        ],
+        "terminal_commands": ["node --version", "npm --version"],
+        "extensions": ["ms-vscode.vscode-typescript-next"]
+    },
+    
+    "Python": {
+        "color": "#3776ab",
+        "icon": "🐍",
+        "urls": [
+            "https://docs.python.org/pt-br/3/",
+            "https://pypi.org/",
+            "https://stackoverflow.com/questions/tagged/python"
+        ],
+        "terminal_commands": ["python --version", "pip --version"],
+        "venv": True,
+        "extensions": ["ms-python.python"]
+    },
+    
+    "Java": {
+        "color": "#007396",
+        "icon": "☕",
+        "urls": [
+            "https://docs.oracle.com/en/java/",
+            "https://www.geeksforgeeks.org/java/",
+            "https://stackoverflow.com/questions/tagged/java"
+        ],
+        "terminal_commands": ["java --version", "javac --version"],
+        "extensions": ["vscjava.vscode-java-pack"],
+        "build": {
+            "command": ["javac", "-d", "out", "src/Main.java"],
+            "inputs": ["src/Main.java"],
+            "outputs": ["out"]
+        }
+    },
+    
+    "C/C++": {
+        "color": "#00599c",
+        "icon": "⚙️",
+        "urls": [
+            "https://en.cppreference.com/",
+            "https://www.geeksforgeeks.org/c-plus-plus/",
+            "https://stackoverflow.com/questions/tagged/c++"
+        ],
+        "terminal_commands": ["g++ --version", "gcc --version"],
+        "extensions": ["ms-vscode.cpptools"],
+        "build": {
+            "command": ["make", "main"],
+            "tools": ["g++"],
+            "inputs": ["main.cpp", "Makefile"],
+            "outputs": ["main"]
+        }
+    },
+    
+    "HTML/CSS/JS": {
+        "color": "#e34c26",
+        "icon": "🌐",
+        "urls": [
+            "https://developer.mozilla.org/pt-BR/",
+            "https://www.w3schools.com/",
+            "https://css-tricks.com/"
+        ],
+        "terminal_commands": [],
+        "live_server": True
+    }
+}
+
+# Conteúdo dos templates embutidos. Fica fora de LANGUAGES para só ser montado
+# quando um projeto é criado (a interface só precisa dos metadados)
+@functools.lru_cache(maxsize=None)
+def builtin_template_files():
+    return {
+        "JavaScript": {
             "index.html": '''<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
@@ -71,19 +822,7 @@ h1 {
     color: #333;
 }'''
         },
-        "urls": [
-            "https://developer.mozilla.org/pt-BR/docs/Web/JavaScript",
-            "https://www.npmjs.com/",
-            "https://github.com"
-        ],
-        "terminal_commands": ["node --version", "npm --version"],
-        "extensions": ["ms-vscode.vscode-typescript-next"]
-    },
-    
-    "Python": {
-        "color": "#3776ab",
-        "icon": "🐍",
-        "files": {
+        "Python": {
             "main.py": '''# Projeto Python
 def main():
     print("Ambiente Python iniciado!")
@@ -108,20 +847,7 @@ env/
 .Python
 '''
         },
-        "urls": [
-            "https://docs.python.org/pt-br/3/",
-            "https://pypi.org/",
-            "https://stackoverflow.com/questions/tagged/python"
-        ],
-        "terminal_commands": ["python --version", "pip --version"],
-        "venv": True,
-        "extensions": ["ms-python.python"]
-    },
-    
-    "Java": {
-        "color": "#007396",
-        "icon": "☕",
-        "files": {
+        "Java": {
             "src/Main.java": '''public class Main {
     public static void main(String[] args) {
         System.out.println("Ambiente Java iniciado!");
@@ -131,6 +857,7 @@ env/
 }
 ''',
             ".gitignore": '''# Java
+out/
 *.class
 *.jar
 *.war
@@ -140,19 +867,7 @@ target/
 *.iml
 '''
         },
-        "urls": [
-            "https://docs.oracle.com/en/java/",
-            "https://www.geeksforgeeks.org/java/",
-            "https://stackoverflow.com/questions/tagged/java"
-        ],
-        "terminal_commands": ["java --version", "javac --version"],
-        "extensions": ["vscjava.vscode-java-pack"]
-    },
-    
-    "C/C++": {
-        "color": "#00599c",
-        "icon": "⚙️",
-        "files": {
+        "C/C++": {
             "main.cpp": '''#include <iostream>
 using namespace std;
 
@@ -178,21 +893,15 @@ clean:
 
 run: $(TARGET)
 \t./$(TARGET)
+''',
+            ".gitignore": '''# C/C++
+/main
+/main.exe
+*.o
+*.obj
 '''
         },
-        "urls": [
-            "https://en.cppreference.com/",
-            "https://www.geeksforgeeks.org/c-plus-plus/",
-            "https://stackoverflow.com/questions/tagged/c++"
-        ],
-        "terminal_commands": ["g++ --version", "gcc --version"],
-        "extensions": ["ms-vscode.cpptools"]
-    },
-    
-    "HTML/CSS/JS": {
-        "color": "#e34c26",
-        "icon": "🌐",
-        "files": {
+        "HTML/CSS/JS": {
             "index.html": '''<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
@@ -245,131 +954,2493 @@ console.log('Site carregado!');
 document.addEventListener('DOMContentLoaded', () => {
     console.log('DOM pronto!');
 });'''
-        },
-        "urls": [
-            "https://developer.mozilla.org/pt-BR/",
-            "https://www.w3schools.com/",
-            "https://css-tricks.com/"
-        ],
-        "terminal_commands": [],
-        "live_server": True
+        }
     }
-}
 
-# ==================== FUNÇÕES AUXILIARES ====================
+def get_template_files(language):
+    """Arquivos do template da linguagem (templates adicionados em LANGUAGES podem trazer "files")"""
+    lang_config = LANGUAGES[language]
+    if "files" in lang_config:
+        return lang_config["files"]
+    if "template_source" in lang_config:
+        return read_template_files(lang_config["template_source"], lang_config["template_kind"])
+    return builtin_template_files().get(language, {})
+
+# ==================== TEMPLATES EM DISCO ====================
+#
+# Cada template fica em CONFIG["templates_dir"], como pasta, .zip ou .abpack:
+#
+#   templates/go/template.json     metadados (name, color, icon, urls,
+#   templates/go/files/...         terminal_commands, extensions, venv, ...)
+#   templates/rust.zip             mesma estrutura dentro do zip
+#   templates/seed.abpack          pacote para templates grandes (ver pack_template)
+#
+# O índice com os metadados fica em cache e só é refeito para os templates cujo
+# mtime mudou; o conteúdo de files/ só é lido ao criar um projeto.
+
+TEMPLATE_META = "template.json"
+TEMPLATE_FILES_DIR = "files"
+
+def _template_kind(path):
+    if path.is_dir():
+        return "dir"
+    if path.suffix.lower() == ".zip":
+        return "zip"
+    if path.suffix.lower() == ".abpack":
+        return "pack"
+    return None
+
+def _template_stamp(path, kind):
+    """mtimes que invalidam a entrada do índice (pasta/arquivo e template.json)"""
+    stamp = [path.stat().st_mtime_ns]
+    if kind == "dir":
+        try:
+            stamp.append((path / TEMPLATE_META).stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+def read_template_meta(path, kind):
+    """Lê o template.json de uma pasta ou zip (ou o índice de um .abpack)"""
+    if kind == "pack":
+        meta = dict(read_pack_index(path)["meta"])
+    elif kind == "zip":
+        import zipfile
+        with zipfile.ZipFile(path) as archive:
+            meta = json.loads(archive.read(TEMPLATE_META).decode('utf-8'))
+    else:
+        meta = json.loads((path / TEMPLATE_META).read_text(encoding='utf-8'))
+    if not isinstance(meta, dict):
+        raise ValueError(f"{TEMPLATE_META} deve conter um objeto")
+    meta.pop("files", None)
+    meta.setdefault("name", path.stem)
+    meta.setdefault("color", "#607d8b")
+    meta.setdefault("icon", "📦")
+    meta.setdefault("urls", [])
+    meta.setdefault("terminal_commands", [])
+    return meta
+
+def read_template_files(source, kind):
+    """Lê os arquivos de um template em disco (conteúdo em bytes, sem conversões)"""
+    source = Path(source)
+    files = {}
+    if kind == "zip":
+        import zipfile
+        prefix = TEMPLATE_FILES_DIR + "/"
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.filename.startswith(prefix) and not info.is_dir():
+                    files[info.filename[len(prefix):]] = archive.read(info)
+    else:
+        base = source / TEMPLATE_FILES_DIR
+        for folder, _, names in os.walk(base):
+            for name in names:
+                full_path = Path(folder) / name
+                files[full_path.relative_to(base).as_posix()] = full_path.read_bytes()
+    return files
+
+def scan_templates(root=None):
+    """Índice {nome: metadados} dos templates em disco, usando o cache quando possível"""
+    root = Path(root or CONFIG["templates_dir"])
+    try:
+        root_mtime = root.stat().st_mtime_ns
+    except OSError:
+        return {}
+    
+    cache = load_cache("templates_index.json")
+    cached = cache.get("entries", {}) if cache.get("root") == str(root) else {}
+    entries, changed = {}, cache.get("root_mtime") != root_mtime
+    
+    for child in sorted(root.iterdir()):
+        kind = _template_kind(child)
+        if not kind:
+            continue
+        try:
+            stamp = _template_stamp(child, kind)
+            entry = cached.get(child.name)
+            if not entry or entry.get("stamp") != stamp:
+                entry = {"stamp": stamp, "kind": kind, "source": str(child),
+                         "meta": read_template_meta(child, kind)}
+                changed = True
+            entries[child.name] = entry
+        except (OSError, ValueError, KeyError) as e:
+            warn(f"template ignorado ({child.name}): {e}")
+    
+    if changed or entries.keys() != cached.keys():
+        save_cache("templates_index.json", {"root": str(root), "root_mtime": root_mtime, "entries": entries})
+    
+    return {entry["meta"]["name"]: dict(entry["meta"], template_source=entry["source"],
+                                        template_kind=entry["kind"])
+            for entry in entries.values()}
+
+def load_template_registry(root=None):
+    """Acrescenta os templates em disco a LANGUAGES (só metadados)"""
+    templates = scan_templates(root)
+    LANGUAGES.update(templates)
+    return list(templates)
+
+# ==================== SONDAGEM DAS FERRAMENTAS ====================
+#
+# Os "terminal_commands" de todas as linguagens rodam juntos (asyncio) quando o
+# programa abre: o total custa o mesmo que o comando mais lento. O resultado fica
+# em cache, invalidado quando o PATH ou algum dos executáveis muda.
+
+def _probe_signature(commands):
+    """Chave do cache: PATH e caminho/mtime/tamanho de cada executável"""
+    tools = {}
+    for command in commands:
+        exe = command.split()[0]
+        path = shutil.which(exe)
+        try:
+            tools[exe] = [os.path.realpath(path)] + file_signature(path) if path else None
+        except OSError:
+            tools[exe] = None
+    return hashlib.sha1(json.dumps([os.environ.get("PATH", ""), tools],
+                                   sort_keys=True).encode()).hexdigest()
+
+async def _probe_command(command, timeout):
+    """Executa um comando de versão; retorna a primeira linha da saída ou None
+
+    Se o comando não responder a tempo, o processo é encerrado e o TimeoutError
+    propagado: um timeout não diz se a ferramenta existe, então não vai ao cache.
+    """
+    import asyncio
+    argv = command.split()
+    if not shutil.which(argv[0]):
+        return None
+    try:
+        proc = await asyncio.create_subprocess_exec(*argv, stdin=subprocess.DEVNULL,
+                                                    stdout=subprocess.PIPE,
+                                                    stderr=subprocess.STDOUT,
+                                                    start_new_session=os.name != 'nt')
+    except OSError:
+        return None
+    try:
+        output, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        # Grupo inteiro: um script (ex.: sh que chama o binário) deixaria o filho
+        # segurando a saída, e o wait só voltaria quando ele terminasse
+        if os.name != 'nt':
+            import signal
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        return None
+    lines = [line.strip() for line in output.decode(errors="replace").splitlines() if line.strip()]
+    return lines[0] if lines else ""
+
+async def _probe_all(commands, timeout):
+    """Sonda os comandos juntos; retorna ({comando: saída ou None}, [comandos sem resposta])"""
+    import asyncio
+    results = await asyncio.gather(*[_probe_command(c, timeout) for c in commands],
+                                   return_exceptions=True)
+    versions, timed_out = {}, []
+    for command, result in zip(commands, results):
+        if isinstance(result, asyncio.TimeoutError):
+            versions[command] = None
+            timed_out.append(command)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            versions[command] = result
+    return versions, timed_out
+
+def short_version(text):
+    """Último número de versão de uma linha como 'Python 3.11.7' ou 'g++ (Debian 12.2.0-14) 12.2.0'"""
+    import re
+    found = re.findall(r"\d+(?:\.\d+)+", text or "")
+    return found[-1] if found else text
+
+@traced
+def probe_toolchains(refresh=False, timeout=None):
+    """Disponibilidade e versão das ferramentas de cada linguagem
+
+    Retorna {linguagem: {"available": bool, "version": str ou None,
+    "versions": {comando: saída ou None}}}.
+    """
+    commands = sorted({c for config in LANGUAGES.values() for c in config.get("terminal_commands", [])})
+    key = _probe_signature(commands)
+    cache = load_cache("toolchains.json")
+    import asyncio
+    if not refresh and cache.get("key") == key:
+        versions = cache.get("versions", {})
+        if cache.get("timed_out"):  # sem resposta da última vez: sondar de novo só esses
+            retried, timed_out = asyncio.run(_probe_all(cache["timed_out"], timeout or CONFIG["probe_timeout"]))
+            versions.update(retried)
+            save_cache("toolchains.json", {"key": key, "versions": versions, "timed_out": timed_out})
+    else:
+        versions, timed_out = asyncio.run(_probe_all(commands, timeout or CONFIG["probe_timeout"]))
+        save_cache("toolchains.json", {"key": key, "versions": versions, "timed_out": timed_out})
+    
+    toolchains = {}
+    for language, config in LANGUAGES.items():
+        found = {c: versions.get(c) for c in config.get("terminal_commands", [])}
+        first = next((v for v in found.values() if v), None)
+        toolchains[language] = {
+            "available": all(v is not None for v in found.values()),
+            "version": short_version(first) if first else None,
+            "versions": found,
+        }
+    return toolchains
+
+# ==================== POOL DE AMBIENTES VIRTUAIS ====================
+
+FICLONE = 0x40049409  # ioctl do Linux para reflink (btrfs, xfs, ...)
+
+def clone_file(src, dst):
+    """Copia um arquivo usando reflink quando o sistema de arquivos suporta"""
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except (OSError, ImportError):
+            pass
+    return shutil.copy2(src, dst)
+
+def python_interpreter():
+    """Interpretador usado para criar os ambientes virtuais"""
+    if getattr(sys, "frozen", False):  # executável gerado pelo PyInstaller
+        return shutil.which("python") or shutil.which("python3") or "python"
+    return sys.executable
+
+def interpreter_key(python):
+    """Identifica o interpretador (versão + caminho) para separar os pools"""
+    if python == sys.executable:
+        version = "%d.%d.%d" % sys.version_info[:3]
+    else:
+        cache = load_cache("interpreters.json")
+        entry = cache.get(python, {})
+        try:
+            signature = file_signature(shutil.which(python) or python)
+        except OSError:
+            signature = None
+        version = entry.get("version") if entry.get("signature") == signature else None
+        if not version:
+            result = run_command([python, "-c", "import platform; print(platform.python_version())"],
+                                    capture_output=True, text=True, timeout=10, check=True)
+            version = result.stdout.strip()
+            cache[python] = {"version": version, "signature": signature}
+            save_cache("interpreters.json", cache)
+    
+    digest = hashlib.sha1(os.path.realpath(shutil.which(python) or python).encode()).hexdigest()[:8]
+    return f"py{version}-{digest}"
+
+def create_fresh_venv(venv_path, python=None):
+    """Cria um venv do zero com 'python -m venv'"""
+    run_command([python or python_interpreter(), "-m", "venv", str(venv_path)],
+                capture_output=True, check=True)
+
+def rewrite_venv_paths(venv_path, old_path):
+    """Atualiza os caminhos absolutos gravados nos scripts de ativação e nos atalhos do venv
+
+    O nome da pasta antiga (prompt do activate) também é trocado, como se o venv
+    tivesse sido criado no destino. Apenas arquivos de texto são reescritos (os
+    .exe do Windows ficam como estão; use 'python -m pip' nesses casos). Cada
+    arquivo é substituído por um novo, para não alterar o original caso ele seja
+    um hardlink/reflink de outro venv.
+    """
+    old, new = os.fsencode(old_path), os.fsencode(str(venv_path))
+    old_name, new_name = os.fsencode(Path(old_path).name), os.fsencode(Path(venv_path).name)
+    candidates = [Path(venv_path) / "pyvenv.cfg"]
+    for scripts in ("bin", "Scripts"):
+        folder = Path(venv_path) / scripts
+        if folder.is_dir():
+            candidates.extend(p for p in folder.iterdir() if p.is_file() and not p.is_symlink())
+    
+    for path in candidates:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        if b"\0" in data[:1024] or old_name not in data:
+            continue
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data.replace(old, new).replace(old_name, new_name))
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+
+class VenvPool:
+    """Pool de venvs pré-criados para um interpretador, reabastecido em segundo plano
+
+    Cada venv do pool fica em 'slot-*'. Ao ser usado, ele é movido (rename) para
+    o projeto, ou copiado com reflink quando estão em sistemas de arquivos
+    diferentes, e os caminhos dos scripts são reescritos.
+    """
+    MARKER = ".abridor_pool.json"
+    
+    def __init__(self, python=None, root=None, size=None, max_age_days=None):
+        self.python = python or python_interpreter()
+        self.root = Path(root or cache_path("venv_pool")) / interpreter_key(self.python)
+        self.size = CONFIG["venv_pool_size"] if size is None else size
+        self.max_age = 86400 * (CONFIG["venv_pool_max_age_days"] if max_age_days is None else max_age_days)
+        self._lock = threading.Lock()
+        self._refilling = False
+    
+    def ready_slots(self):
+        """Venvs prontos, do mais antigo para o mais novo"""
+        try:
+            slots = [p for p in self.root.iterdir() if p.name.startswith("slot-")]
+        except OSError:
+            return []
+        return sorted(slots, key=lambda p: p.name)
+    
+    def evict(self):
+        """Remove venvs expirados, excedentes e sobras de operações interrompidas"""
+        now = time.time()
+        slots = self.ready_slots()
+        for slot in slots[:max(0, len(slots) - self.size)]:
+            shutil.rmtree(slot, ignore_errors=True)
+        # Outros processos (modo lote) podem pegar ou remover um venv a qualquer momento
+        for slot in slots[-self.size:] if self.size else []:
+            try:
+                expired = now - slot.stat().st_mtime > self.max_age
+            except OSError:
+                continue
+            if expired:
+                shutil.rmtree(slot, ignore_errors=True)
+        
+        try:
+            leftovers = [p for p in self.root.iterdir() if p.name.startswith(("building-", "claimed-"))]
+        except OSError:
+            leftovers = []
+        for path in leftovers:
+            try:
+                stale = now - path.stat().st_mtime > 3600
+            except OSError:
+                continue
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def acquire(self, dest):
+        """Move um venv do pool para 'dest'. Retorna False se o pool estiver vazio"""
+        self.evict()
+        for slot in self.ready_slots():
+            # O rename é atômico: outro processo não consegue pegar o mesmo venv
+            claimed = slot.with_name("claimed-" + slot.name[5:])
+            try:
+                os.rename(slot, claimed)
+            except OSError:
+                continue
+            
+            try:
+                built_at = json.loads((claimed / self.MARKER).read_text(encoding='utf-8'))["path"]
+                try:
+                    os.rename(claimed, dest)
+                except OSError:  # sistemas de arquivos diferentes
+                    shutil.copytree(claimed, dest, symlinks=True, copy_function=clone_file)
+                    shutil.rmtree(claimed, ignore_errors=True)
+                (Path(dest) / self.MARKER).unlink()
+                rewrite_venv_paths(dest, built_at)
+                return True
+            except (OSError, ValueError, KeyError) as e:
+                warn(f"venv do pool descartado: {e}")
+                shutil.rmtree(claimed, ignore_errors=True)
+                shutil.rmtree(dest, ignore_errors=True)
+        return False
+    
+    def fill(self):
+        """Cria venvs até completar o tamanho do pool"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        while len(self.ready_slots()) < self.size:
+            stamp = f"{time.time_ns()}-{os.getpid()}"
+            building = self.root / f"building-{stamp}"
+            try:
+                create_fresh_venv(building, self.python)
+                (building / self.MARKER).write_text(json.dumps({"path": str(building)}), encoding='utf-8')
+                os.rename(building, self.root / f"slot-{stamp}")
+            except (OSError, subprocess.SubprocessError) as e:
+                warn(f"Não foi possível reabastecer o pool de venvs: {e}")
+                shutil.rmtree(building, ignore_errors=True)
+                return
+    
+    def refill_async(self):
+        """Reabastece o pool em uma thread de segundo plano"""
+        with self._lock:
+            if self._refilling or self.size <= 0:
+                return None
+            self._refilling = True
+        
+        def worker():
+            try:
+                self.fill()
+            finally:
+                self._refilling = False
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
+
+_venv_pools = {}
+
+def get_venv_pool(python=None):
+    """Pool compartilhado para o interpretador informado"""
+    python = python or python_interpreter()
+    if python not in _venv_pools:
+        _venv_pools[python] = VenvPool(python)
+    return _venv_pools[python]
+
+# ==================== GIT ====================
+
+GIT_CONFIG_FILES = [
+    Path.home() / ".gitconfig",
+    Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config") / "git" / "config",
+]
+GIT_IDENTITY_ENV = ["GIT_AUTHOR_NAME", "GIT_AUTHOR_EMAIL", "GIT_COMMITTER_NAME",
+                    "GIT_COMMITTER_EMAIL", "EMAIL"]
+
+def _git_config_signature():
+    """Assinatura das configurações globais do git (branch padrão, identidade, ...)"""
+    signature = []
+    for path in GIT_CONFIG_FILES:
+        try:
+            signature.append(file_signature(path))
+        except OSError:
+            signature.append(None)
+    signature.append([os.environ.get(name) for name in GIT_IDENTITY_ENV])
+    return signature
+
+def git_skeleton_root(git):
+    """Pasta do .git modelo para este git e estas configurações (pode ainda não existir)"""
+    key_source = json.dumps([os.path.realpath(git), file_signature(git), _git_config_signature()])
+    return cache_path("git_skeleton") / hashlib.sha1(key_source.encode()).hexdigest()[:16]
+
+def git_skeleton(git):
+    """Diretório .git modelo, gerado uma única vez por instalação do git
+
+    A chave combina o binário (caminho + mtime) e as configurações globais, que
+    definem a branch padrão e o template usados pelo 'git init'.
+    """
+    root = git_skeleton_root(git)
+    skeleton = root / ".git"
+    if skeleton.is_dir():
+        return skeleton
+    
+    building = root.with_name(f"{root.name}.{os.getpid()}.tmp")
+    shutil.rmtree(building, ignore_errors=True)
+    run_command([git, "init", "-q", str(building)], capture_output=True, check=True)
+    try:
+        os.rename(building, root)
+    except OSError:  # outro processo gerou o mesmo modelo ao mesmo tempo
+        shutil.rmtree(building, ignore_errors=True)
+    return skeleton
+
+def git_identity(git):
+    """Identidade do committer ('Nome <email>'), em cache até a configuração mudar"""
+    signature = _git_config_signature()
+    cache = load_cache("git.json")
+    if cache.get("signature") == signature and cache.get("ident"):
+        return cache["ident"]
+    
+    result = run_command([git, "var", "GIT_COMMITTER_IDENT"], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception("Configure o git (user.name e user.email) para fazer o commit inicial")
+    ident = result.stdout.strip().rsplit(" ", 2)[0]  # remove data e fuso
+    save_cache("git.json", {"signature": signature, "ident": ident})
+    return ident
+
+def _fast_import_path(path):
+    if any(c in path for c in '"\\\n') or path.startswith(" "):
+        return '"' + path.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+    return path
+
+def git_initial_commit(git, project_path, paths, message="Commit inicial"):
+    """Cria o commit inicial com 'git fast-import', sem 'add'/'commit' em série"""
+    project_path = Path(project_path)
+    head = (project_path / ".git" / "HEAD").read_text(encoding='utf-8').strip()
+    branch = head[len("ref: "):] if head.startswith("ref: ") else "refs/heads/main"
+    
+    offset = time.localtime().tm_gmtoff // 60
+    when = f"{int(time.time())} {'+' if offset >= 0 else '-'}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+    
+    stream = bytearray()
+    modifications = []
+    for mark, rel in enumerate(sorted(paths), start=1):
+        full_path = project_path / rel
+        data = full_path.read_bytes()
+        stream += b"blob\nmark :%d\ndata %d\n" % (mark, len(data)) + data + b"\n"
+        mode = "100755" if os.access(full_path, os.X_OK) and os.name != 'nt' else "100644"
+        modifications.append(f"M {mode} :{mark} {_fast_import_path(rel)}\n")
+    
+    ident = git_identity(git)
+    msg = message.encode('utf-8')
+    stream += f"commit {branch}\ncommitter {ident} {when}\n".encode('utf-8')
+    stream += b"data %d\n" % len(msg) + msg + b"\n"
+    stream += "".join(modifications).encode('utf-8') + b"\n"
+    
+    run_command([git, "fast-import", "--quiet"], cwd=project_path, input=bytes(stream),
+                capture_output=True, check=True)
+    # O fast-import não toca no índice: sincronizar com o commit
+    run_command([git, "reset", "-q"], cwd=project_path, capture_output=True, check=True)
+
+@traced
+def init_git_repo(project_path, commit_paths=None):
+    """Inicializa o repositório copiando o .git modelo do cache
+
+    Cai para 'git init' apenas se o modelo não puder ser gerado. Com
+    'commit_paths', faz o commit inicial desses arquivos. Retorna False se o
+    projeto já era um repositório.
+    """
+    git = shutil.which("git")
+    if not git:
+        raise Exception("Git não encontrado no PATH")
+    
+    git_dir = Path(project_path) / ".git"
+    if git_dir.exists():
+        return False
+    
+    try:
+        shutil.copytree(git_skeleton(git), git_dir, symlinks=True)
+    except (OSError, subprocess.SubprocessError):
+        shutil.rmtree(git_dir, ignore_errors=True)
+        run_command([git, "init", "-q"], cwd=project_path, capture_output=True, check=True)
+    
+    # O manifesto é do Abridor, não do projeto: fica fora do git em qualquer template
+    if git_dir.is_dir():
+        exclude = git_dir / "info" / "exclude"
+        exclude.parent.mkdir(parents=True, exist_ok=True)
+        with open(exclude, "a", encoding='utf-8') as f:
+            f.write(f"/{PROJECT_MANIFEST}\n")
+    
+    if commit_paths:
+        git_initial_commit(git, project_path, commit_paths)
+    return True
+
+def scaffolded_files(report):
+    """Arquivos do template presentes no projeto, segundo o relatório da estrutura"""
+    return report.get("created", []) + report.get("updated", []) + report.get("skipped", [])
+
+# ==================== EXTENSÕES DO VS CODE ====================
+
+def installed_extensions(vscode_path, refresh=False):
+    """Extensões instaladas, listadas com um único 'code --list-extensions' e guardadas em cache"""
+    cache = load_cache("vscode_extensions.json")
+    entry = cache.get(vscode_path)
+    if (entry and not refresh
+            and time.time() - entry.get("checked", 0) < CONFIG["extensions_cache_ttl"]):
+        return set(entry.get("extensions", []))
+    
+    result = run_command([vscode_path, "--list-extensions"], capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise Exception(f"Não foi possível listar as extensões: {result.stderr.strip()}")
+    extensions = {line.strip().lower() for line in result.stdout.splitlines() if line.strip()}
+    cache[vscode_path] = {"checked": time.time(), "extensions": sorted(extensions)}
+    save_cache("vscode_extensions.json", cache)
+    return extensions
+
+def install_missing_extensions(vscode_path, extensions):
+    """Instala, em uma única chamada do VS Code, apenas as extensões que faltam
+
+    Retorna a lista de extensões instaladas (vazia se todas já existiam).
+    """
+    installed = installed_extensions(vscode_path)
+    missing = [ext for ext in extensions if ext.lower() not in installed]
+    if not missing:
+        return []
+    
+    cmd = [vscode_path]
+    for ext in missing:
+        cmd += ["--install-extension", ext]
+    result = run_command(cmd, capture_output=True, text=True, timeout=600)
+    if result.returncode != 0:
+        details = (result.stderr or result.stdout).strip().splitlines()[-1:] or [f"código {result.returncode}"]
+        raise Exception(f"Falha ao instalar {', '.join(missing)}: {details[0]}")
+    
+    cache = load_cache("vscode_extensions.json")
+    entry = cache.setdefault(vscode_path, {"checked": time.time(), "extensions": []})
+    entry["extensions"] = sorted(set(entry["extensions"]) | {ext.lower() for ext in missing})
+    save_cache("vscode_extensions.json", cache)
+    return missing
+
+@traced
+def setup_vscode_extensions(language):
+    """Garante as extensões recomendadas para a linguagem"""
+    extensions = LANGUAGES[language].get("extensions", [])
+    vscode_path = get_vscode_path()
+    if not extensions or not vscode_path:
+        return []
+    return install_missing_extensions(vscode_path, extensions)
+
+# ==================== TEMPLATES EMPACOTADOS (.abpack) ====================
+#
+# Para templates com milhares de arquivos. Formato (sem compressão):
+#
+#   [ABPACK1\n][... dados de cada arquivo, alinhados em 4 KiB ...][índice JSON]
+#   [tamanho do índice: 8 bytes little-endian][ABPACK1\n]
+#
+# O índice traz os metadados do template e, para cada arquivo, offset, tamanho,
+# modo e sha256. Na extração os dados vão do pacote para o projeto pelo kernel
+# (reflink, copy_file_range ou sendfile), sem carregar os arquivos no Python.
+
+PACK_MAGIC = b"ABPACK1\n"
+PACK_ALIGN = 4096
+FICLONERANGE = 0x4020940d  # ioctl do Linux para reflink de um trecho
+
+def _align(offset):
+    return (offset + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
+
+def pack_template(src_dir, out_path):
+    """Gera um .abpack a partir de uma pasta de template (template.json + files/)"""
+    src_dir, out_path = Path(src_dir), Path(out_path)
+    meta = read_template_meta(src_dir, "dir")
+    base = src_dir / TEMPLATE_FILES_DIR
+    entries = []
+    
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp, "wb") as out:
+        out.write(PACK_MAGIC)
+        offset = len(PACK_MAGIC)
+        for folder, dirs, names in os.walk(base):
+            dirs.sort()
+            for name in sorted(names):
+                full_path = Path(folder) / name
+                st = full_path.stat()
+                padding = _align(offset) - offset
+                out.write(b"\0" * padding)
+                offset += padding
+                
+                digest = hashlib.sha256()
+                with open(full_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+                        out.write(chunk)
+                entries.append({"path": full_path.relative_to(base).as_posix(), "offset": offset,
+                                "size": st.st_size, "mode": st.st_mode & 0o777,
+                                "sha256": digest.hexdigest()})
+                offset += st.st_size
+        
+        index = json.dumps({"meta": meta, "files": entries}, ensure_ascii=False).encode('utf-8')
+        out.write(index)
+        out.write(len(index).to_bytes(8, "little"))
+        out.write(PACK_MAGIC)
+    os.replace(tmp, out_path)
+    return len(entries)
+
+def read_pack_index(path):
+    """Lê só o índice do final do pacote
+
+    Acrescenta "data_end": onde terminam os dados dos arquivos (início do índice).
+    """
+    with open(path, "rb") as f:
+        total = f.seek(0, os.SEEK_END)
+        if total < 2 * len(PACK_MAGIC) + 8:
+            raise ValueError(f"{Path(path).name} não é um pacote .abpack válido")
+        f.seek(-16, os.SEEK_END)
+        trailer = f.read(16)
+        if trailer[8:] != PACK_MAGIC:
+            raise ValueError(f"{Path(path).name} não é um pacote .abpack válido")
+        size = int.from_bytes(trailer[:8], "little")
+        data_end = total - 16 - size
+        if data_end < len(PACK_MAGIC):
+            raise ValueError(f"{Path(path).name}: índice maior que o pacote")
+        f.seek(data_end)
+        index = json.loads(f.read(size).decode('utf-8'))
+    index["data_end"] = data_end
+    return index
+
+def _reflink_range(src_fd, dst_fd, offset, length):
+    """Reflink de um trecho alinhado (btrfs, xfs); retorna False se não for suportado"""
+    import fcntl
+    import struct
+    try:
+        fcntl.ioctl(dst_fd, FICLONERANGE, struct.pack("qQQQ", src_fd, offset, length, 0))
+        return True
+    except OSError:
+        return False
+
+def _copy_range(src_fd, src_map, dst_fd, offset, size, state):
+    """Copia 'size' bytes do pacote (a partir de 'offset') para o início de dst_fd"""
+    done = 0
+    # Blocos inteiros por reflink (os dados no pacote são alinhados)
+    whole = size // PACK_ALIGN * PACK_ALIGN
+    if whole and state.get("reflink", sys.platform.startswith("linux")):
+        if _reflink_range(src_fd, dst_fd, offset, whole):
+            done = whole
+            os.lseek(dst_fd, whole, os.SEEK_SET)
+        else:
+            state["reflink"] = False
+    
+    while done < size:
+        count = min(size - done, 1 << 30)
+        copied = 0
+        if state.get("copy_file_range", hasattr(os, "copy_file_range")):
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, count, offset + done)
+            except OSError:
+                state["copy_file_range"] = False
+        if not copied and state.get("sendfile", hasattr(os, "sendfile")):
+            try:
+                copied = os.sendfile(dst_fd, src_fd, offset + done, count)
+            except OSError:
+                state["sendfile"] = False
+        if not copied:  # último recurso: fatias do mmap, sem ler o arquivo inteiro
+            copied = os.write(dst_fd, src_map[offset + done:offset + done + min(count, 1 << 20)])
+        if not copied:  # fim do pacote antes do esperado: tentar de novo não adianta
+            raise Exception(f"Erro ao extrair pacote: cópia interrompida em {done} de {size} bytes")
+        done += copied
+
+def _pack_digest(src_map, offset, size):
+    """sha256 de um trecho do pacote, em fatias de 1 MB"""
+    digest = hashlib.sha256()
+    for start in range(offset, offset + size, 1 << 20):
+        digest.update(src_map[start:min(start + (1 << 20), offset + size)])
+    return digest.hexdigest()
+
+def classify_pack(project_path, index, manifest):
+    """Como classify_files, para os itens do índice de um pacote (sem gravar nada)"""
+    entries = manifest.setdefault("files", {})
+    report = {"created": [], "updated": [], "skipped": [], "conflicts": []}
+    to_write = []
+    for item in index["files"]:
+        offset, size = item["offset"], item["size"]
+        if offset < len(PACK_MAGIC) or size < 0 or offset + size > index["data_end"]:
+            raise Exception(f"Erro no pacote: {item['path']} aponta para fora da área de dados")
+        full_path = project_file(project_path, item["path"])
+        try:
+            st = full_path.stat()
+        except FileNotFoundError:
+            to_write.append((item, full_path, "created"))
+            continue
+        action = classify_existing(full_path, st, entries.get(item["path"]), item["sha256"])
+        if action == "updated":
+            to_write.append((item, full_path, action))
+        else:
+            report[action].append(item["path"])
+    return report, to_write
+
+@traced
+def materialize_pack(pack_path, project_path, manifest, workers=8):
+    """Extrai os arquivos do pacote que faltam (ou estão intactos) no projeto
+
+    Segue as mesmas regras de scaffold_files: arquivos modificados pelo usuário
+    são preservados e listados em 'conflicts'.
+    """
+    import mmap
+    
+    project_path = Path(project_path)
+    report, to_write = classify_pack(project_path, read_pack_index(pack_path), manifest)
+    entries = manifest["files"]
+    if not to_write:
+        return report
+    
+    # Cada diretório é criado uma única vez, antes das gravações em paralelo
+    for folder in sorted({full_path.parent for _, full_path, _ in to_write}):
+        folder.mkdir(parents=True, exist_ok=True)
+    
+    state = {}  # quais mecanismos de cópia funcionam neste sistema de arquivos
+    lock = threading.Lock()
+    
+    with open(pack_path, "rb") as src:
+        src_map = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        def write_one(job):
+            item, full_path, action = job
+            # Confere o trecho antes de abrir (e truncar) o arquivo de destino
+            if _pack_digest(src_map, item["offset"], item["size"]) != item["sha256"]:
+                raise Exception(f"Erro no pacote: {item['path']} não confere com o sha256 do índice")
+            fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, item["mode"] or 0o644)
+            try:
+                _copy_range(src.fileno(), src_map, fd, item["offset"], item["size"], state)
+            finally:
+                os.close(fd)
+            entry = _file_entry(full_path, item["sha256"])
+            with lock:
+                entries[item["path"]] = entry
+                report[action].append(item["path"])
+            return item["size"]
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                written = sum(pool.map(write_one, to_write))
+        finally:
+            src_map.close()
+    
+    record_bytes_written(written)
+    return report
+
+# ==================== DEPENDÊNCIAS (WHEELHOUSE / CACHE DO NPM) ====================
+#
+# As dependências declaradas pelo template (metadado "dependencies": {"pip": [...],
+# "npm": [...]}) e as do requirements.txt/package.json do projeto são instaladas a
+# partir de caches locais compartilhados. Com o cache quente, nada vai à rede.
+
+def prune_cache_dir(path, max_bytes):
+    """Remove os arquivos usados há mais tempo até a pasta caber em 'max_bytes' (LRU)"""
+    files, total = [], 0
+    for folder, _, names in os.walk(path):
+        for name in names:
+            full_path = os.path.join(folder, name)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            files.append((max(st.st_atime, st.st_mtime), st.st_size, full_path))
+            total += st.st_size
+    
+    removed = 0
+    for _, size, full_path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(full_path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+def venv_python(venv_path):
+    """Interpretador dentro do venv"""
+    if os.name == 'nt':
+        return str(Path(venv_path) / "Scripts" / "python.exe")
+    return str(Path(venv_path) / "bin" / "python")
+
+def project_dependencies(project_path, language, files=None):
+    """Dependências do template e dos arquivos do projeto, por ferramenta
+
+    'files' (conteúdo ainda não gravado, de um LaunchPlan) tem prioridade sobre o disco.
+    """
+    declared = LANGUAGES[language].get("dependencies", {})
+    deps = {"pip": list(declared.get("pip", [])), "npm": list(declared.get("npm", []))}
+    files = files or {}
+    
+    requirements = Path(project_path) / "requirements.txt"
+    if "requirements.txt" in files:
+        text = file_bytes(files["requirements.txt"]).decode('utf-8')
+    else:
+        text = requirements.read_text(encoding='utf-8') if requirements.exists() else ""
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line and not line.startswith("-"):
+            deps["pip"].append(line)
+    
+    if "package.json" in files or (Path(project_path) / "package.json").exists():
+        deps["npm"].append(".")  # instala o que o package.json declara
+    return {tool: names for tool, names in deps.items() if names}
+
+DEPENDENCY_FILES = ("requirements.txt", "package.json")
+
+def template_dependency_files(language, files=None):
+    """requirements.txt/package.json que o template grava no projeto ({caminho: bytes})
+
+    'files' é o conteúdo já montado (LaunchPlan); os de um .abpack são lidos direto
+    do pacote, sem extrair nada.
+    """
+    lang_config = LANGUAGES[language]
+    files = get_template_files(language) if files is None else files
+    found = {rel: file_bytes(files[rel]) for rel in DEPENDENCY_FILES if rel in files}
+    if lang_config.get("template_kind") == "pack":
+        source = lang_config["template_source"]
+        items = [item for item in read_pack_index(source)["files"]
+                 if item["path"] in DEPENDENCY_FILES and item["path"] not in found]
+        if items:
+            with open(source, "rb") as f:
+                for item in items:
+                    f.seek(item["offset"])
+                    found[item["path"]] = f.read(item["size"])
+    return found
+
+def install_pip_dependencies(project_path, packages):
+    """Instala pelo wheelhouse local; só baixa (para o wheelhouse) o que faltar"""
+    wheelhouse = cache_path("wheelhouse")
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    python = venv_python(Path(project_path) / "venv")
+    offline = [python, "-m", "pip", "install", "--no-index", "--find-links", str(wheelhouse),
+               "--disable-pip-version-check"] + packages
+    
+    stage_progress("pip: instalando do cache local...")
+    result = run_command(offline, cwd=project_path, capture_output=True, text=True)
+    if result.returncode != 0:
+        stage_progress("pip: baixando para o cache local...")
+        download = run_command([python, "-m", "pip", "download", "-d", str(wheelhouse),
+                                "--disable-pip-version-check"] + packages,
+                               cwd=project_path, capture_output=True, text=True)
+        if download.returncode != 0:
+            raise Exception(f"pip download falhou: {download.stderr.strip().splitlines()[-1:]}")
+        stage_progress("pip: instalando do cache local...")
+        result = run_command(offline, cwd=project_path, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise Exception(f"pip install falhou: {result.stderr.strip().splitlines()[-1:]}")
+    
+    # Marca como usados os pacotes do wheelhouse (base do LRU)
+    now = time.time()
+    for line in result.stdout.splitlines():
+        if str(wheelhouse) in line:
+            candidate = line[line.index(str(wheelhouse)):].split()[0]
+            try:
+                os.utime(candidate, (now, now))
+            except OSError:
+                pass
+    prune_cache_dir(wheelhouse, CONFIG["wheelhouse_max_mb"] * 1024 * 1024)
+    return len(packages)
+
+def install_npm_dependencies(project_path, packages):
+    """npm install com o cache offline compartilhado (--prefer-offline)"""
+    npm = shutil.which("npm")
+    if not npm:
+        raise Exception("npm não encontrado no PATH")
+    npm_cache = cache_path("npm_cache")
+    packages = [p for p in packages if p != "."]
+    
+    stage_progress("npm: instalando (cache local)...")
+    result = run_command([npm, "install", "--cache", str(npm_cache), "--prefer-offline",
+                          "--no-audit", "--no-fund"] + packages,
+                         cwd=project_path, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f"npm install falhou: {result.stderr.strip().splitlines()[-1:]}")
+    prune_cache_dir(npm_cache, CONFIG["npm_cache_max_mb"] * 1024 * 1024)
+    return len(packages) or 1
+
+@traced
+def install_dependencies(project_path, language):
+    """Instala as dependências do projeto a partir dos caches locais
+
+    Retorna {ferramenta: quantidade} das instalações feitas.
+    """
+    deps = project_dependencies(project_path, language)
+    done = {}
+    if deps.get("pip") and (Path(project_path) / "venv").exists():
+        done["pip"] = install_pip_dependencies(project_path, deps["pip"])
+    if deps.get("npm"):
+        done["npm"] = install_npm_dependencies(project_path, deps["npm"])
+    return done
+
+# ==================== COMPILAÇÃO EM CACHE ====================
+#
+# Linguagens com "build" ({"command", "inputs", "outputs", "tools"}) são compiladas
+# em segundo plano ao criar o projeto. As saídas ficam em um cache compartilhado,
+# indexado pelo comando, pelas ferramentas (caminho + mtime/tamanho) e pelo hash
+# das entradas: recriar o mesmo template só copia o binário/as classes prontas.
+
+def _tool_signature(tool):
+    """Caminho real e assinatura de um executável do PATH"""
+    path = shutil.which(tool)
+    if not path:
+        raise Exception(f"{tool} não encontrado no PATH")
+    path = os.path.realpath(path)
+    return [path] + file_signature(path)
+
+def build_cache_key(project_path, build, contents=None):
+    """Chave do cache: comando, ferramentas e conteúdo das entradas
+
+    'contents' ({caminho: bytes}) permite calcular a chave antes de gravar os arquivos.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(build["command"]).encode())
+    for tool in [build["command"][0]] + list(build.get("tools", [])):
+        digest.update(json.dumps(_tool_signature(tool)).encode())
+    for rel in build.get("inputs", []):
+        if contents is not None and rel in contents:
+            source_hash = hashlib.sha256(contents[rel]).hexdigest()
+        else:
+            source_hash = hash_file(Path(project_path) / rel)
+        digest.update(rel.encode() + b"\0" + source_hash.encode())
+    return digest.hexdigest()[:24]
+
+def _copy_outputs(src_root, dst_root, outputs, touch=False):
+    """Copia arquivos ou pastas de saída (com reflink quando possível)
+
+    Com 'touch', as cópias ficam mais novas que as fontes (o make não recompila).
+    """
+    for rel in outputs:
+        src, dst = Path(src_root) / rel, Path(dst_root) / rel
+        files = [f for f in src.rglob("*") if f.is_file()] if src.is_dir() else [src]
+        for f in files:
+            target = dst / f.relative_to(src) if src.is_dir() else dst
+            target.parent.mkdir(parents=True, exist_ok=True)
+            clone_file(f, target)
+            if touch:
+                os.utime(target)
+
+def _record_build_stats(hit):
+    stats = load_cache("build_stats.json")
+    stats["hits" if hit else "misses"] = stats.get("hits" if hit else "misses", 0) + 1
+    save_cache("build_stats.json", stats)
+    return stats
+
+@traced
+def warm_build(project_path, language):
+    """Compila o projeto usando o cache de saídas
+
+    Retorna {"cached", "seconds", "hits", "misses"} (totais acumulados do cache).
+    """
+    build = LANGUAGES[language]["build"]
+    start = time.perf_counter()
+    key = build_cache_key(project_path, build)
+    entry = cache_path("build") / key
+    
+    hit = (entry / ".complete").exists()
+    if hit:
+        stage_progress("copiando do cache...")
+        _copy_outputs(entry, project_path, build["outputs"], touch=True)
+        os.utime(entry / ".complete")
+    else:
+        stage_progress(" ".join(build["command"]))
+        result = run_command(build["command"], cwd=project_path, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise Exception(f"compilação falhou: {(result.stderr or result.stdout).strip()}")
+        
+        # Grava em uma pasta temporária e publica com rename (builds simultâneos)
+        building = entry.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.rmtree(building, ignore_errors=True)
+        building.mkdir(parents=True)
+        _copy_outputs(project_path, building, build["outputs"])
+        (building / ".complete").touch()
+        try:
+            os.rename(building, entry)
+        except OSError:
+            shutil.rmtree(building, ignore_errors=True)  # outro processo publicou antes
+        prune_build_cache(CONFIG["build_cache_max_mb"] * 1024 * 1024)
+    
+    stats = _record_build_stats(hit)
+    return {"cached": hit, "seconds": time.perf_counter() - start,
+            "hits": stats.get("hits", 0), "misses": stats.get("misses", 0)}
+
+def prune_build_cache(max_bytes):
+    """Remove as entradas de compilação usadas há mais tempo (inteiras, nunca pela metade)"""
+    root = cache_path("build")
+    entries, total = [], 0
+    for entry in root.iterdir():
+        marker = entry / ".complete"
+        if not marker.exists():
+            continue
+        size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+        entries.append((marker.stat().st_mtime, size, entry))
+        total += size
+    
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+
+# ==================== TERMINAL ====================
+#
+# O terminal de cada projeto é aberto por um "backend" detectado uma única vez:
+#   tmux      - cada projeto vira uma janela em uma sessão persistente (uma sessão
+#               para N projetos); um emulador é aberto só para anexar a sessão
+#   emulator  - uma janela de um emulador disponível (gnome-terminal, konsole...)
+#   windows   - Windows Terminal (uma janela, uma aba por projeto) ou cmd
+#   macos     - Terminal.app
+#   headless  - sem terminal gráfico: só indica o comando para entrar no projeto
+
+TERMINAL_EMULATORS = [
+    ("gnome-terminal", ["--working-directory", "{path}", "--", "{shell}", "-c", "{script}"]),
+    ("konsole", ["--workdir", "{path}", "-e", "{shell}", "-c", "{script}"]),
+    ("xfce4-terminal", ["--working-directory", "{path}", "-x", "{shell}", "-c", "{script}"]),
+    ("alacritty", ["--working-directory", "{path}", "-e", "{shell}", "-c", "{script}"]),
+    ("kitty", ["--directory", "{path}", "{shell}", "-c", "{script}"]),
+    ("xterm", ["-e", "{shell}", "-c", "{script}"]),
+    ("x-terminal-emulator", ["-e", "{shell}", "-c", "{script}"]),
+]
+
+_tmux_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def detect_terminal_backend():
+    """Escolhe o backend de terminal (CONFIG["terminal_backend"] ou detecção automática)"""
+    choice = CONFIG["terminal_backend"]
+    has_display = bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    emulator = None
+    if os.name != 'nt' and sys.platform != "darwin" and has_display:
+        emulator = next(((name, args) for name, args in TERMINAL_EMULATORS if shutil.which(name)), None)
+    backend = {"kind": "headless", "tmux": shutil.which("tmux"), "emulator": emulator}
+    
+    if choice != "auto":
+        backend["kind"] = choice
+    elif os.name == 'nt':
+        backend["kind"] = "windows"
+    elif backend["tmux"]:
+        backend["kind"] = "tmux"
+    elif sys.platform == "darwin":
+        backend["kind"] = "macos"
+    elif emulator:
+        backend["kind"] = "emulator"
+    return backend
+
+def terminal_startup_commands(project_path, language):
+    """Comandos executados ao abrir o terminal: ativar o venv e os terminal_commands"""
+    commands = []
+    if (Path(project_path) / "venv").is_dir():
+        if os.name == 'nt':
+            commands.append("call venv\\Scripts\\activate.bat")
+        else:
+            commands.append(". venv/bin/activate")
+    return commands + list(LANGUAGES[language].get("terminal_commands", []))
+
+def _shell_script(project_path, commands):
+    import shlex
+    shell = os.environ.get("SHELL") or "/bin/sh"
+    lines = [f"cd {shlex.quote(str(project_path))}"] + commands + [f"exec {shlex.quote(shell)}"]
+    return shell, "; ".join(lines)
+
+def open_emulator(emulator, project_path, commands):
+    """Abre uma janela do emulador executando 'commands' na pasta do projeto"""
+    name, template = emulator
+    shell, script = _shell_script(project_path, commands)
+    args = [arg.format(shell=shell, script=script, path=project_path) for arg in template]
+    spawn_process([shutil.which(name) or name] + args, name="terminal", cwd=str(project_path))
+    return name
+
+def open_tmux_window(backend, project_path, language):
+    """Cria a janela do projeto na sessão tmux (criando a sessão só na primeira vez)"""
+    tmux, session = backend["tmux"], CONFIG["tmux_session"]
+    window_name = Path(project_path).name
+    with _tmux_lock:
+        exists = run_command([tmux, "has-session", "-t", f"={session}"], capture_output=True).returncode == 0
+        if exists:
+            cmd = [tmux, "new-window", "-t", f"={session}:", "-n", window_name]
+        else:
+            cmd = [tmux, "new-session", "-d", "-s", session, "-n", window_name]
+        result = run_command(cmd + ["-c", str(project_path), "-P", "-F", "#{window_id}"],
+                             capture_output=True, text=True)
+        if result.returncode != 0:
+            raise Exception(f"tmux: {result.stderr.strip()}")
+        window = result.stdout.strip()
+    
+    for command in terminal_startup_commands(project_path, language):
+        run_command([tmux, "send-keys", "-t", window, command, "Enter"], capture_output=True)
+    
+    # Fora do tmux, um único emulador anexa a sessão (se ninguém estiver anexado)
+    attached = run_command([tmux, "list-clients", "-t", f"={session}"], capture_output=True, text=True)
+    if not os.environ.get("TMUX") and not attached.stdout.strip() and backend["emulator"]:
+        open_emulator(backend["emulator"], project_path, [f"tmux attach -t ={session}"])
+    return f"tmux: janela '{window_name}' na sessão '{session}' (tmux attach -t {session})"
+
+def open_windows_terminal(project_path, language):
+    """Windows Terminal (uma aba por projeto na mesma janela) ou uma janela do cmd"""
+    lines = ["@echo off", f'cd /d "{project_path}"', "echo ========================================",
+             f"echo Ambiente {language} iniciado!", "echo ========================================", "echo."]
+    lines += terminal_startup_commands(project_path, language)
+    lines += ["echo.", "echo Pronto para programar!"]
+    script = "\n".join(lines) + "\n"
+    
+    batch_path = Path(project_path) / "start_env.bat"
+    if not batch_path.exists() or batch_path.read_text(encoding='utf-8') != script:
+        batch_path.write_text(script, encoding='utf-8')
+        record_bytes_written(len(script.encode('utf-8')))
+    
+    wt = shutil.which("wt")
+    if wt:
+        spawn_process([wt, "-w", CONFIG["tmux_session"], "new-tab", "-d", str(project_path),
+                       "--title", Path(project_path).name, "cmd", "/k", str(batch_path)], name="terminal")
+        return "Windows Terminal"
+    spawn_process(["cmd", "/c", "start", "cmd", "/k", str(batch_path)], name="terminal", shell=True)
+    return "cmd"
+
+# ==================== DOCUMENTAÇÃO OFFLINE ====================
+#
+# As páginas de "urls" de cada linguagem são espelhadas em docs/ (um arquivo por
+# página, com limite de tamanho e descarte LRU) e o índice fica em docs_index.json.
+# Processos de longa duração (interface, daemon) servem o espelho por HTTP local;
+# nos demais, a página é aberta direto do arquivo. Sem cópia, abre a URL original.
+
+BROWSER_CANDIDATES = ["firefox", "google-chrome", "chromium", "chromium-browser",
+                      "brave-browser", "microsoft-edge"]
+DOCS_MAX_PAGE_BYTES = 10 * 1024 * 1024
+
+_docs_server = None
+_docs_lock = threading.Lock()
+
+def _docs_object_name(url, content_type):
+    import mimetypes
+    ext = mimetypes.guess_extension((content_type or "").split(";")[0].strip()) or ".html"
+    return hashlib.sha1(url.encode('utf-8')).hexdigest() + (".html" if ext in (".htm", ".html") else ext)
+
+def cached_doc(url):
+    """Entrada do espelho para a URL, ou None se não houver cópia local"""
+    entry = load_cache("docs_index.json").get(url)
+    if entry and cache_path("docs").joinpath(entry["object"]).exists():
+        return entry
+    return None
+
+def _with_base(body, url):
+    """Faz os links relativos da página apontarem para o site original
+
+    O <base> entra logo após o <head> (ou o doctype): antes do doctype a página
+    cairia no modo quirks. Se a página já tem um <base>, só o href vira absoluto.
+    """
+    import html
+    import re
+    from urllib.parse import urljoin
+    head = body[:65536]
+    existing = re.search(rb"(<base\s[^>]*?href\s*=\s*)([\"']?)([^\"'\s>]*)\2", head, re.IGNORECASE)
+    if existing:
+        href = urljoin(url, html.unescape(existing.group(3).decode('utf-8', 'replace')))
+        value = b'"' + html.escape(href).encode('utf-8') + b'"'
+        return body[:existing.start()] + existing.group(1) + value + body[existing.end():]
+    tag = f'<base href="{html.escape(url)}">'.encode('utf-8')
+    for pattern in (rb"<head(?:\s[^>]*)?>", rb"<!doctype[^>]*>", rb"<html(?:\s[^>]*)?>"):
+        found = re.search(pattern, head, re.IGNORECASE)
+        if found:
+            return body[:found.end()] + tag + body[found.end():]
+    return tag + body
+
+def store_doc(url, body, content_type, index=None):
+    """Grava uma página no espelho (e no índice recebido ou no do disco)"""
+    name = _docs_object_name(url, content_type)
+    html_page = (content_type or "").startswith("text/html")
+    if html_page:  # vale também quando a cópia é aberta direto do arquivo (file://)
+        body = _with_base(body, url)
+    path = cache_path("docs") / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+    record_bytes_written(len(body))
+    
+    entry = {"object": name, "content_type": content_type, "size": len(body), "fetched": time.time()}
+    if html_page:
+        entry["base"] = True
+    if index is None:
+        with _docs_lock:
+            index = load_cache("docs_index.json")
+            index[url] = entry
+            save_cache("docs_index.json", index)
+    else:
+        index[url] = entry
+    return entry
+
+def _prune_docs():
+    removed = prune_cache_dir(cache_path("docs"), CONFIG["docs_cache_max_mb"] * 1024 * 1024)
+    if removed:
+        with _docs_lock:
+            index = load_cache("docs_index.json")
+            index = {url: e for url, e in index.items() if cache_path("docs").joinpath(e["object"]).exists()}
+            save_cache("docs_index.json", index)
+
+def _fetch_doc(url):
+    from urllib.request import Request, urlopen
+    request = Request(url, headers={"User-Agent": "abridor-ambiente (cache de documentação)"})
+    with urlopen(request, timeout=CONFIG["docs_timeout"]) as response:
+        body = response.read(DOCS_MAX_PAGE_BYTES + 1)
+        if len(body) > DOCS_MAX_PAGE_BYTES:
+            raise Exception("página maior que o limite do espelho")
+        return body, response.headers.get("Content-Type", "text/html")
+
+def mirror_docs(urls, workers=4):
+    """Baixa as páginas em paralelo para o espelho; retorna {url: erro ou None}"""
+    def fetch(url):
+        try:
+            return url, _fetch_doc(url), None
+        except Exception as e:
+            return url, None, str(e)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = list(pool.map(fetch, urls))
+    
+    status = {}
+    with _docs_lock:
+        index = load_cache("docs_index.json")
+        for url, page, error in fetched:
+            if page:
+                store_doc(url, page[0], page[1], index)
+            status[url] = error
+        save_cache("docs_index.json", index)
+    _prune_docs()
+    return status
+
+def import_docs_archive(archive):
+    """Importa páginas já baixadas de um .zip/.tar(.gz) com urls.json ({url: arquivo})"""
+    import mimetypes
+    archive = Path(archive)
+    try:
+        mapping, pages = _read_docs_archive(archive)
+    except Exception as e:
+        raise Exception(f"Erro ao importar {archive.name}: {e}")
+    
+    with _docs_lock:
+        index = load_cache("docs_index.json")
+        for url, body in pages.items():
+            content_type = mimetypes.guess_type(mapping[url])[0] or "text/html"
+            store_doc(url, body, content_type, index)
+        save_cache("docs_index.json", index)
+    _prune_docs()
+    return len(pages)
+
+def _read_docs_archive(archive):
+    if archive.suffix.lower() == ".zip":
+        import zipfile
+        with zipfile.ZipFile(archive) as zf:
+            read = zf.read
+            mapping = json.loads(read("urls.json"))
+            pages = {url: read(member) for url, member in mapping.items()}
+    else:
+        import tarfile
+        with tarfile.open(archive) as tf:
+            def read(member):
+                return tf.extractfile(member).read()
+            mapping = json.loads(read("urls.json"))
+            pages = {url: read(member) for url, member in mapping.items()}
+    return mapping, pages
+
+def start_docs_server():
+    """Servidor HTTP local (127.0.0.1, porta livre) que entrega o espelho; retorna a URL base"""
+    global _docs_server
+    with _docs_lock:
+        if _docs_server:
+            return _docs_server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlsplit
+        
+        class DocsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                url = parse_qs(parts.query).get("url", [""])[0]
+                if parts.path != "/doc" or not url.startswith(("http://", "https://")):
+                    self.send_error(404)
+                    return
+                entry = cached_doc(url)
+                if entry is None:  # sem cópia local: vai para a página original
+                    self.send_response(302)
+                    self.send_header("Location", url)
+                    self.end_headers()
+                    return
+                path = cache_path("docs") / entry["object"]
+                body = path.read_bytes()
+                os.utime(path)  # usado agora (LRU)
+                if entry["content_type"].startswith("text/html") and not entry.get("base"):
+                    body = _with_base(body, url)  # cópia gravada antes de store_doc incluir o <base>
+                self.send_response(200)
+                self.send_header("Content-Type", entry["content_type"])
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), DocsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _docs_server = f"http://127.0.0.1:{server.server_address[1]}"
+        return _docs_server
+
+def local_doc_url(url):
+    """Endereço da cópia local (servidor ou arquivo), ou None se não houver cópia"""
+    entry = cached_doc(url)
+    if entry is None:
+        return None
+    if _docs_server:
+        from urllib.parse import quote
+        return f"{_docs_server}/doc?url={quote(url, safe='')}"
+    path = cache_path("docs") / entry["object"]
+    os.utime(path)
+    return path.as_uri()
+
+_browser_found = []  # [executável ou None] depois da primeira busca
+
+def find_browser():
+    """Executável do navegador que aceita várias URLs em uma chamada (None = usar webbrowser)"""
+    if not _browser_found:
+        _browser_found.append(_detect_browser())
+    return _browser_found[0]
+
+def known_browser():
+    """Navegador já conhecido, sem executar nada: (executável ou None, conhecido?)"""
+    if CONFIG["browser"] != "default":
+        return shutil.which(CONFIG["browser"]) or CONFIG["browser"], True
+    if _browser_found:
+        return _browser_found[0], True
+    return None, False
+
+def _detect_browser():
+    if CONFIG["browser"] != "default":
+        return shutil.which(CONFIG["browser"]) or CONFIG["browser"]
+    if sys.platform.startswith("linux"):
+        try:
+            result = run_command(["xdg-settings", "get", "default-web-browser"],
+                                 capture_output=True, text=True, timeout=5)
+            name = result.stdout.strip().replace(".desktop", "").split(".")[-1]
+            if name and shutil.which(name):
+                return shutil.which(name)
+        except (OSError, subprocess.SubprocessError):
+            pass
+    if os.name == 'nt':
+        return None
+    return next((shutil.which(b) for b in BROWSER_CANDIDATES if shutil.which(b)), None)
+
+def open_urls(urls):
+    """Abre todas as URLs com uma única chamada ao navegador quando possível"""
+    if not urls:
+        return
+    if sys.platform == "darwin" and CONFIG["browser"] == "default":
+        spawn_process(["open"] + list(urls), name="navegador")
+        return
+    browser = find_browser()
+    if browser:
+        spawn_process([browser] + list(urls), name="navegador")
+        return
+    import webbrowser
+    for url in urls:
+        webbrowser.open(url)
+
+# ==================== FUNÇÕES AUXILIARES ====================
+
+PROJECT_MANIFEST = ".abridor_manifest.json"
+
+def load_project_manifest(project_path):
+    """Lê o manifesto com os hashes dos arquivos gerados a partir do template"""
+    try:
+        data = json.loads((Path(project_path) / PROJECT_MANIFEST).read_text(encoding='utf-8'))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_project_manifest(project_path, manifest):
+    path = Path(project_path) / PROJECT_MANIFEST
+    tmp = path.with_name(path.name + ".tmp")
+    data = json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    record_bytes_written(len(data))
+
+def _file_entry(path, digest):
+    st = path.stat()
+    return {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def hash_file(path):
+    """sha256 de um arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def classify_existing(full_path, st, entry, digest):
+    """Decide o que fazer com um arquivo que já existe: 'skipped', 'updated' ou 'conflicts'"""
+    # Caminho rápido: o arquivo não mudou desde a última gravação (só um stat)
+    if entry and [st.st_size, st.st_mtime_ns] == [entry.get("size"), entry.get("mtime_ns")]:
+        current = entry.get("sha256")
+    else:
+        current = hash_file(full_path)
+    
+    if current == digest:
+        return "skipped"
+    if entry and current == entry.get("sha256"):
+        return "updated"  # ainda intacto, mas o template mudou
+    return "conflicts"
+
+def file_bytes(content):
+    """Bytes gravados para o conteúdo de um template"""
+    if isinstance(content, bytes):  # templates em disco: cópia exata
+        return content
+    return content.replace("\n", os.linesep).encode('utf-8')  # igual ao write_text
+
+def project_file(project_path, rel):
+    """Caminho de 'rel' dentro do projeto; recusa caminhos absolutos ou que saiam da pasta"""
+    normal = os.path.normpath(rel)
+    if (os.path.isabs(rel) or os.path.splitdrive(rel)[0] or rel.startswith(("/", "\\"))
+            or normal == os.curdir or normal == os.pardir or normal.startswith(os.pardir + os.sep)):
+        raise Exception(f"Erro no template: caminho fora do projeto: {rel}")
+    return project_path / normal
+
+def classify_files(project_path, files, manifest, create_only=()):
+    """Decide, sem gravar nada, o que fazer com cada arquivo do template
+
+    Retorna (relatório dos arquivos que não serão gravados, lista a gravar).
+    """
+    report = {"created": [], "updated": [], "skipped": [], "conflicts": []}
+    entries = manifest.setdefault("files", {})
+    to_write = []
+    
+    for rel, content in files.items():
+        data = file_bytes(content)
+        digest = hashlib.sha256(data).hexdigest()
+        full_path = project_file(project_path, rel)
+        
+        try:
+            st = full_path.stat()
+        except FileNotFoundError:
+            to_write.append((rel, full_path, data, digest, "created"))
+            continue
+        
+        if rel in create_only:
+            report["skipped"].append(rel)
+            continue
+        
+        action = classify_existing(full_path, st, entries.get(rel), digest)
+        if action == "updated":
+            to_write.append((rel, full_path, data, digest, action))
+            continue
+        report[action].append(rel)
+        if action == "skipped" and entries.get(rel) != _file_entry(full_path, digest):
+            entries[rel] = _file_entry(full_path, digest)
+    return report, to_write
+
+def scaffold_files(project_path, files, manifest, create_only=()):
+    """Grava apenas os arquivos ausentes ou ainda intactos do template
+
+    Um arquivo é "intacto" quando o conteúdo em disco ainda é o que foi gerado
+    (conferido pelo manifesto: tamanho/mtime e, se preciso, o hash). Arquivos
+    alterados pelo usuário nunca são sobrescritos e aparecem em 'conflicts'.
+    Arquivos em 'create_only' são gerados apenas se não existirem.
+    """
+    report, to_write = classify_files(project_path, files, manifest, create_only)
+    entries = manifest["files"]
+    
+    # Cada diretório é criado uma única vez
+    for folder in sorted({full_path.parent for _, full_path, _, _, _ in to_write}):
+        folder.mkdir(parents=True, exist_ok=True)
+    
+    for rel, full_path, data, digest, action in to_write:
+        full_path.write_bytes(data)
+        record_bytes_written(len(data))
+        entries[rel] = _file_entry(full_path, digest)
+        report[action].append(rel)
+    
+    return report
+
+def project_files(language, project_name):
+    """Arquivos do template para o projeto, incluindo o README (templates .abpack ficam de fora)"""
+    lang_config = LANGUAGES[language]
+    packed = lang_config.get("template_kind") == "pack"
+    files = {} if packed else dict(get_template_files(language))
+    
+    # Criar README
+    files["README.md"] = f"""# {project_name}
+
+**Linguagem:** {language}
+**Criado em:** {datetime.now().strftime('%d/%m/%Y às %H:%M')}
+
+## Descrição
+Projeto criado automaticamente pelo Abridor de Ambiente de Estudo.
+
+## Como usar
+[Adicione instruções aqui]
+
+## Tecnologias
+- {language}
+
+## Autor
+Seu nome aqui
+"""
+    return files
+
+@traced
+def create_project_structure(language, project_name, base_dir, report=None, files=None):
+    """Cria a estrutura de pastas e arquivos do projeto
+
+    Pode ser executada de novo sobre um projeto existente: só grava o que falta
+    ou o que ainda está como o template gerou. Se 'report' for um dicionário,
+    recebe as listas de arquivos criados, atualizados, ignorados e em conflito.
+    'files' (de um LaunchPlan) substitui os arquivos calculados aqui.
+    """
+    project_path = Path(base_dir) / project_name
+    
+    try:
+        project_path.mkdir(parents=True, exist_ok=True)
+        
+        lang_config = LANGUAGES[language]
+        packed = lang_config.get("template_kind") == "pack"
+        files = project_files(language, project_name) if files is None else files
+        
+        manifest = load_project_manifest(project_path)
+        before = json.dumps(manifest, sort_keys=True)
+        manifest["language"] = language
+        
+        # Criar arquivos do template
+        summary = scaffold_files(project_path, files, manifest, create_only=("README.md",))
+        if packed:  # templates grandes: extraídos direto do pacote, sem passar pela memória
+            for action, paths in materialize_pack(lang_config["template_source"], project_path,
+                                                  manifest).items():
+                summary[action].extend(paths)
+        if json.dumps(manifest, sort_keys=True) != before:
+            save_project_manifest(project_path, manifest)
+        if report is not None:
+            report.update(summary)
+        
+        record_project(project_path, language)
+        return str(project_path)
+    except Exception as e:
+        raise Exception(f"Erro ao criar projeto: {e}")
+
+@traced
+def open_vscode(project_path, language):
+    """Abre o VS Code no projeto"""
+    try:
+        vscode_path = get_vscode_path()
+        
+        # Se não encontrou o VS Code, mostrar erro amigável
+        if not vscode_path:
+            raise Exception("VS Code não encontrado!\n\nPor favor:\n1. Instale o VS Code em: https://code.visualstudio.com/\n2. Ou edite o código e defina o caminho manualmente")
+        
+        # Tentar abrir (as extensões ficam a cargo de setup_vscode_extensions)
+        spawn_process([vscode_path, project_path], name="VS Code")
+    except FileNotFoundError:
+        raise Exception(f"VS Code não encontrado em: {vscode_path}\n\nInstale em: https://code.visualstudio.com/")
+    except Exception as e:
+        raise Exception(f"Erro ao abrir VS Code: {e}")
+
+@traced
+def open_browser_tabs(urls):
+    """Abre as URLs no navegador, de uma vez, usando a cópia local quando existir"""
+    try:
+        targets = [local_doc_url(url) or url for url in urls]
+        open_urls(targets)
+    except Exception as e:
+        raise Exception(f"Erro ao abrir navegador: {e}")
+    
+    # Páginas sem cópia local são espelhadas para as próximas vezes
+    misses = [url for url, target in zip(urls, targets) if target == url]
+    if misses and CONFIG["docs_mirror"] and _resident_process:
+        threading.Thread(target=mirror_docs, args=(misses,), daemon=True).start()
+    return targets
+
+@traced
+def setup_python_venv(project_path, refill=True):
+    """Cria ambiente virtual Python, usando um venv pronto do pool quando houver
+
+    O pool só é reabastecido em segundo plano na interface e no daemon.
+    """
+    try:
+        venv_path = Path(project_path) / "venv"
+        if venv_path.exists():
+            return str(venv_path)
+        
+        pool = get_venv_pool() if CONFIG["venv_pool_size"] > 0 else None
+        if not (pool and pool.acquire(venv_path)):
+            create_fresh_venv(venv_path)
+        
+        if pool and refill and _resident_process:
+            pool.refill_async()
+        return str(venv_path)
+    except Exception as e:
+        raise Exception(f"Erro ao criar venv: {e}")
+
+@traced
+def open_terminal(project_path, language):
+    """Abre o terminal no diretório do projeto pelo backend detectado
+
+    Retorna a descrição de onde o terminal foi aberto.
+    """
+    try:
+        backend = detect_terminal_backend()
+        kind = backend["kind"]
+        
+        if kind == "windows":
+            return open_windows_terminal(project_path, language)
+        if kind == "tmux":
+            return open_tmux_window(backend, project_path, language)
+        if kind == "macos":
+            spawn_process(["open", "-a", "Terminal", str(project_path)], name="terminal")
+            return "Terminal.app"
+        if kind == "emulator" and backend["emulator"]:
+            commands = terminal_startup_commands(project_path, language)
+            return open_emulator(backend["emulator"], project_path, commands)
+        return f"sem terminal gráfico: cd {project_path}"
+    except Exception as e:
+        warn(f"Não foi possível abrir terminal: {e}")
+
+# ==================== PROJETOS RECENTES ====================
+#
+# Índice SQLite (projects.db) com os projetos criados ou encontrados na pasta de
+# projetos. A varredura é incremental: uma pasta só é relida quando o mtime dela
+# mudou desde a última vez (criar/remover arquivos ou pastas altera o mtime).
+
+def _project_markers():
+    """Arquivos que identificam cada linguagem nos projetos sem manifesto"""
+    markers = {}
+    for language, files in builtin_template_files().items():
+        markers[language] = [path for path in files if path not in ("README.md", ".gitignore")]
+    return markers
+
+def detect_project_language(project_path):
+    """Linguagem de uma pasta de projeto (pelo manifesto ou pelos arquivos do template)"""
+    language = load_project_manifest(project_path).get("language")
+    if language:
+        return language
+    for language, markers in _project_markers().items():
+        if markers and all((Path(project_path) / marker).exists() for marker in markers):
+            return language
+    return None
+
+class ProjectIndex:
+    """Projetos conhecidos: linguagem, caminho, venv e última abertura"""
+
+    SCHEMA = """
+        PRAGMA journal_mode = WAL;
+        CREATE TABLE IF NOT EXISTS projects (
+            path TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            language TEXT,
+            venv TEXT,
+            created REAL,
+            last_opened REAL
+        );
+        CREATE TABLE IF NOT EXISTS scanned_dirs (
+            path TEXT PRIMARY KEY,
+            parent TEXT,
+            mtime_ns INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS scanned_dirs_parent ON scanned_dirs (parent);
+    """
+    COLUMNS = ("path", "name", "language", "venv", "created", "last_opened")
+    
+    def __init__(self, path=None):
+        self.path = Path(path or cache_path("projects.db"))
+    
+    @contextmanager
+    def connect(self):
+        import sqlite3
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            conn.executescript(self.SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _upsert(self, conn, path, language, created=None, opened=None):
+        venv = Path(path) / "venv"
+        venv = str(venv) if venv.is_dir() or LANGUAGES.get(language, {}).get("venv") else None
+        conn.execute("INSERT OR IGNORE INTO projects (path, name, created) VALUES (?, ?, ?)",
+                     (path, os.path.basename(path), created or time.time()))
+        conn.execute("UPDATE projects SET language = ?, venv = ?, "
+                     "last_opened = COALESCE(?, last_opened) WHERE path = ?",
+                     (language, venv, opened, path))
+    
+    def record(self, project_path, language, opened=True):
+        """Registra (ou atualiza) um projeto; 'opened' marca a abertura agora"""
+        with self.connect() as conn:
+            self._upsert(conn, os.path.abspath(project_path), language,
+                         opened=time.time() if opened else None)
+    
+    def mark_opened(self, project_path):
+        with self.connect() as conn:
+            conn.execute("UPDATE projects SET last_opened = ? WHERE path = ?",
+                         (time.time(), os.path.abspath(project_path)))
+    
+    def get(self, project_path):
+        with self.connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM projects WHERE path = ?",
+                               (os.path.abspath(project_path),)).fetchone()
+        return dict(zip(self.COLUMNS, row)) if row else None
+    
+    def recent(self, query="", limit=20):
+        """Projetos mais recentes cujo nome, caminho ou linguagem contém 'query'"""
+        pattern = f"%{query}%"
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM projects "
+                "WHERE name LIKE ? OR path LIKE ? OR language LIKE ? "
+                "ORDER BY COALESCE(last_opened, created) DESC LIMIT ?",
+                (pattern, pattern, pattern, limit)).fetchall()
+            missing = [row[0] for row in rows if not os.path.isdir(row[0])]
+            conn.executemany("DELETE FROM projects WHERE path = ?", [(p,) for p in missing])
+        return [dict(zip(self.COLUMNS, row)) for row in rows if row[0] not in missing]
+    
+    def crawl(self, root=None):
+        """Descobre projetos em 'root' relendo só as pastas cujo mtime mudou
+
+        Retorna quantas pastas de projeto foram relidas.
+        """
+        root = os.path.abspath(root or CONFIG["base_projects_dir"])
+        try:
+            root_mtime = os.stat(root).st_mtime_ns
+        except OSError:
+            return 0
+        
+        rescanned = 0
+        with self.connect() as conn:
+            known = dict(conn.execute("SELECT path, mtime_ns FROM scanned_dirs WHERE path = ? OR parent = ?",
+                                      (root, root)))
+            if known.get(root) == root_mtime:
+                children = [path for path in known if path != root]
+            else:
+                with os.scandir(root) as entries:
+                    children = [entry.path for entry in entries
+                                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")]
+                gone = [(path,) for path in known if path != root and path not in set(children)]
+                conn.executemany("DELETE FROM scanned_dirs WHERE path = ?", gone)
+                conn.executemany("DELETE FROM projects WHERE path = ?", gone)
+                conn.execute("INSERT OR REPLACE INTO scanned_dirs VALUES (?, NULL, ?)", (root, root_mtime))
+            
+            for child in children:
+                try:
+                    st = os.stat(child)
+                except OSError:
+                    continue
+                if known.get(child) == st.st_mtime_ns:
+                    continue
+                rescanned += 1
+                language = detect_project_language(child)
+                if language:
+                    self._upsert(conn, child, language, created=st.st_mtime)
+                else:
+                    conn.execute("DELETE FROM projects WHERE path = ?", (child,))
+                conn.execute("INSERT OR REPLACE INTO scanned_dirs VALUES (?, ?, ?)",
+                             (child, root, st.st_mtime_ns))
+        return rescanned
+
+def record_project(project_path, language):
+    """Registra o projeto no índice de recentes (falhas só geram aviso)"""
+    try:
+        ProjectIndex().record(project_path, language)
+    except Exception as e:
+        warn(f"Não foi possível atualizar os projetos recentes: {e}")
+
+def find_project(ref):
+    """Projeto do índice por caminho ou nome (o mais recente com esse nome)"""
+    index = ProjectIndex()
+    if os.path.isdir(ref):
+        project = index.get(ref)
+        if project:
+            return project
+        language = detect_project_language(ref)
+        if language:
+            index.record(ref, language, opened=False)
+            return index.get(ref)
+    index.crawl()
+    matches = [p for p in index.recent(ref, limit=50) if p["name"] == ref]
+    return matches[0] if matches else None
+
+# ==================== MANUTENÇÃO (USO DE DISCO) ====================
+#
+# Cada projeto é medido por uma thread que percorre a árvore com os.scandir (pilha
+# de pastas pendentes, sem recursão e sem guardar a lista de arquivos): a memória
+# não cresce com o número de arquivos. O venv é medido à parte e não conta para a
+# data da última modificação. Arquivar (tar.gz) roda em um pool de processos.
+
+def dir_usage(path, skip=()):
+    """Bytes em disco, quantidade de arquivos e mtime mais recente de uma árvore"""
+    usage = {"bytes": 0, "files": 0, "latest": 0.0}
+    root = str(path)
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (current == root and entry.name in skip):
+                                stack.append(entry.path)
+                                usage["latest"] = max(usage["latest"], st.st_mtime)
+                            continue
+                    except OSError:
+                        continue
+                    # st_blocks reflete o espaço real (arquivos esparsos, reflinks)
+                    usage["bytes"] += st.st_blocks * 512 if hasattr(st, "st_blocks") else st.st_size
+                    usage["files"] += 1
+                    usage["latest"] = max(usage["latest"], st.st_mtime)
+        except OSError:
+            continue
+    return usage
+
+def is_managed_project(project_path):
+    """True se a pasta foi criada pelo Abridor (tem o manifesto)
+
+    Só essas podem ser arquivadas ou removidas: os arquivos do template sozinhos
+    (main.py + requirements.txt, index.html...) também aparecem em pastas do usuário.
+    """
+    return (Path(project_path) / PROJECT_MANIFEST).is_file()
+
+def project_usage(project_path):
+    """Tamanho do projeto, do venv e última modificação (fora do venv)"""
+    project_path = Path(project_path)
+    rest = dir_usage(project_path, skip=("venv",))
+    venv = project_path / "venv"
+    venv_usage = dir_usage(venv) if venv.is_dir() else {"bytes": 0, "files": 0}
+    latest = rest["latest"] or project_path.stat().st_mtime
+    return {
+        "path": str(project_path),
+        "name": project_path.name,
+        "language": detect_project_language(project_path),
+        "managed": is_managed_project(project_path),
+        "bytes": rest["bytes"] + venv_usage["bytes"],
+        "venv_bytes": venv_usage["bytes"],
+        "files": rest["files"] + venv_usage["files"],
+        "last_modified": latest,
+        "idle_days": (time.time() - latest) / 86400,
+    }
+
+def scan_projects(root=None, workers=8):
+    """Mede todas as pastas da pasta de projetos em paralelo (maiores primeiro)"""
+    root = Path(root or CONFIG["base_projects_dir"])
+    with os.scandir(root) as entries:
+        folders = [entry.path for entry in entries
+                   if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        projects = list(pool.map(project_usage, folders))
+    return sorted(projects, key=lambda p: p["bytes"], reverse=True)
+
+def archive_project(project_path, archive_dir=None):
+    """Compacta o projeto em tar.gz (sem o venv, que é recriável) e remove a pasta
+
+    Sem 'archive_dir', apenas remove. Retorna o caminho do arquivo (ou None).
+    """
+    import tarfile
+    project_path = Path(project_path)
+    if not is_managed_project(project_path):
+        raise Exception(f"{project_path} não foi criado pelo Abridor (sem {PROJECT_MANIFEST}); nada foi removido")
+    archive = None
+    if archive_dir:
+        archive_dir = Path(archive_dir)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        archive = archive_dir / f"{project_path.name}-{datetime.now().strftime('%Y%m%d')}.tar.gz"
+        tmp = archive.with_name(archive.name + f".{os.getpid()}.tmp")
+        
+        def without_venv(info):
+            top = info.name.split("/", 2)
+            return None if len(top) > 1 and top[1] == "venv" else info
+        
+        with tarfile.open(tmp, "w:gz", compresslevel=6) as tar:
+            tar.add(str(project_path), arcname=project_path.name, filter=without_venv)
+        os.replace(tmp, archive)
+    shutil.rmtree(project_path)
+    return str(archive) if archive else None
+
+def _archive_worker(args):
+    project_path, archive_dir = args
+    try:
+        return project_path, archive_project(project_path, archive_dir), None
+    except Exception as e:
+        return project_path, None, str(e)
+
+def select_idle_projects(projects, idle_days):
+    """Projetos criados pelo Abridor e parados há mais de 'idle_days' dias"""
+    return [p for p in projects if p["managed"] and p["idle_days"] > idle_days]
+
+def archive_idle_projects(projects, idle_days, archive_dir=None, workers=None):
+    """Arquiva (ou remove) os projetos parados há mais de 'idle_days' dias
+
+    Só pastas com o manifesto do Abridor são tocadas; as reconhecidas apenas pelos
+    arquivos do template ficam de fora. Retorna [(caminho, arquivo ou None, erro ou None)].
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    targets = [(p["path"], archive_dir) for p in select_idle_projects(projects, idle_days)]
+    if not targets:
+        return []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return list(pool.map(_archive_worker, targets))
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+# ==================== PIPELINE DE INICIALIZAÇÃO ====================
+
+class Stage:
+    """Etapa do pipeline de inicialização e suas dependências"""
+
+    def __init__(self, name, func, deps=(), label=None, optional=False, background=False, timeout=None):
+        self.name = name
+        self.func = func  # recebe o dicionário de resultados das etapas anteriores
+        self.deps = tuple(deps)
+        self.label = label or name
+        self.optional = optional  # falhas não interrompem o ambiente
+        self.background = background  # o ambiente fica "pronto" sem esperar por ela
+        self.timeout = timeout  # limite (s) de cada subprocesso executado pela etapa
+
+def stage_progress(text):
+    """Reporta o andamento da etapa em execução na thread (sem efeito fora do pipeline)"""
+    emit_event("progress", text=text)
+
+def current_stage_timeout():
+    """Timeout da etapa em execução na thread (None fora do pipeline)"""
+    return getattr(_stage_local, "timeout", None)
+
+def _run_stage(stage, results, tracer, events, timings):
+    _stage_local.events, _stage_local.stage = events, stage.name
+    _stage_local.timeout = stage.timeout
+    events.emit("stage_start", stage.name, label=stage.label, optional=stage.optional,
+                background=stage.background)
+    start = time.perf_counter()
+    try:
+        if tracer is None:
+            return stage.func(results)
+        with tracer.activate(), tracer.span(stage.name, category="stage"):
+            return stage.func(results)
+    finally:
+        timings[stage.name] = time.perf_counter() - start
+        _stage_local.events = _stage_local.stage = _stage_local.timeout = None
+
+def run_stage_graph(stages, events=None, max_workers=4, tracer=None):
+    """Executa as etapas em threads, iniciando cada uma assim que suas dependências terminam
+
+    Dependências que não fazem parte do grafo são ignoradas. Etapas cujas
+    dependências falharam são puladas. Com um 'tracer', cada etapa vira um span
+    e os eventos vão para o trace. Os eventos saem em 'events' (um EventBus):
+    stage_start, stage_end (status done, error ou skipped, com o resultado ou o
+    erro), os dos auxiliares durante cada etapa, "ready" quando as etapas que
+    não são de segundo plano terminam e "end" no fim. Retorna (resultados, erros).
+    """
+    events = events or EventBus()
+    if tracer is not None:
+        events.subscribe(tracer.record_event)
+    names = {stage.name for stage in stages}
+    pending = {stage.name: stage for stage in stages}
+    foreground = {stage.name for stage in stages if not stage.background}
+    results, errors, timings = {}, {}, {}
+    running = {}
+    state = {"ok": True}
+    
+    def finish(stage, status, payload=None):
+        if status != "done" and payload is not None and not stage.optional:
+            state["ok"] = False
+        events.emit("stage_end", stage.name, status=status, label=stage.label, optional=stage.optional,
+                    background=stage.background, seconds=timings.get(stage.name, 0.0),
+                    **{"result" if status == "done" else "error": payload})
+        if stage.name in foreground:
+            foreground.discard(stage.name)
+            if not foreground:
+                events.emit("ready", ok=state["ok"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                deps = [d for d in stage.deps if d in names]
+                if any(d in errors for d in deps):
+                    del pending[name]
+                    errors[name] = None  # pulada: propaga a falha para os dependentes
+                    finish(stage, "skipped")
+                elif all(d in results for d in deps):
+                    del pending[name]
+                    running[pool.submit(_run_stage, stage, results, tracer, events, timings)] = stage
+
+            if not running:
+                break  # dependências cíclicas ou inexistentes
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                    finish(stage, "done", results[stage.name])
+                except Exception as e:
+                    errors[stage.name] = e
+                    finish(stage, "error", e)
+
+    for name, stage in pending.items():
+        errors[name] = Exception(f"Dependências não resolvidas na etapa '{name}'")
+        finish(stage, "error", errors[name])
+    events.emit("end", ok=state["ok"], errors={name: str(e) for name, e in errors.items() if e is not None})
+    if tracer is not None:
+        events.unsubscribe(tracer.record_event)
+    return results, errors
+
+def build_launch_stages(language, project_name, base_dir, open_browser=True, open_terminal_window=True,
+                        init_git=True, git_commit=None, scaffold_report=None, open_editor=True, files=None,
+                        warm=True):
+    """Monta o grafo de etapas para iniciar o ambiente de uma linguagem
 
-def create_project_structure(language, project_name, base_dir):
-    """Cria a estrutura de pastas e arquivos do projeto"""
-    project_path = Path(base_dir) / project_name
+    'files' vem do LaunchPlan; com warm=False, dependências e compilação ficam de fora.
+    """
+    lang_config = LANGUAGES[language]
+    scaffold_report = {} if scaffold_report is None else scaffold_report
+    git_commit = CONFIG["git_initial_commit"] if git_commit is None else git_commit
+    stages = [
+        Stage("structure", lambda r: create_project_structure(language, project_name, base_dir,
+                                                              report=scaffold_report, files=files),
+              label="📁 Criando estrutura do projeto..."),
+    ]
     
-    try:
-        project_path.mkdir(parents=True, exist_ok=True)
-        
-        # Criar arquivos do template
-        for file_path, content in LANGUAGES[language]["files"].items():
-            full_path = project_path / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text(content, encoding='utf-8')
-        
-        # Criar README
-        readme = f"""# {project_name}
+    if open_editor:
+        stages.append(Stage("vscode", lambda r: open_vscode(r["structure"], language),
+                            deps=["structure"], label="💻 Abrindo VS Code..."))
 
-**Linguagem:** {language}
-**Criado em:** {datetime.now().strftime('%d/%m/%Y às %H:%M')}
+    if lang_config.get("venv"):
+        stages.append(Stage("venv", lambda r: setup_python_venv(r["structure"]),
+                            deps=["structure"], label="🐍 Criando ambiente virtual Python...", timeout=300))
+    
+    if open_editor and lang_config.get("extensions"):
+        stages.append(Stage("extensions", lambda r: setup_vscode_extensions(language),
+                            label="🧩 Verificando extensões...", optional=True, background=True))
+    
+    if init_git:
+        stages.append(Stage("git", lambda r: init_git_repo(
+                                r["structure"], scaffolded_files(scaffold_report) if git_commit else None),
+                            deps=["structure"], label="🔧 Inicializando Git...", optional=True, timeout=60))
 
-## Descrição
-Projeto criado automaticamente pelo Abridor de Ambiente de Estudo.
+    # Dependências são instaladas depois que o VS Code abre, sem atrasar o "pronto"
+    has_dependencies = (lang_config.get("venv") or lang_config.get("dependencies")
+                        or (Path(base_dir) / project_name / "package.json").exists())
+    if warm and CONFIG["warm_dependencies"] and (has_dependencies or template_dependency_files(language, files)):
+        stages.append(Stage("dependencies", lambda r: install_dependencies(r["structure"], language),
+                            deps=["structure", "venv", "vscode"], label="📦 Instalando dependências...",
+                            optional=True, background=True, timeout=1800))
+    
+    if warm and CONFIG["warm_build"] and lang_config.get("build"):
+        stages.append(Stage("build", lambda r: warm_build(r["structure"], language),
+                            deps=["structure", "vscode"], label="🔨 Compilando...",
+                            optional=True, background=True, timeout=600))
+    
+    # A documentação não depende do projeto: abre junto com a criação dos arquivos
+    if open_browser:
+        stages.append(Stage("browser", lambda r: open_browser_tabs(lang_config["urls"]),
+                            label="🌐 Abrindo documentação..."))
 
-## Como usar
-[Adicione instruções aqui]
+    # O terminal ativa o venv, então espera por ele quando existir
+    if open_terminal_window:
+        stages.append(Stage("terminal", lambda r: open_terminal(r["structure"], language),
+                            deps=["structure", "venv"], label="⌨️ Abrindo terminal...",
+                            optional=True))
 
-## Tecnologias
-- {language}
+    return stages
 
-## Autor
-Seu nome aqui
-"""
-        (project_path / "README.md").write_text(readme, encoding='utf-8')
+def _reopen_project(project_path):
+    if not Path(project_path).is_dir():
+        raise Exception(f"A pasta do projeto não existe mais: {project_path}")
+    ProjectIndex().mark_opened(project_path)
+    return str(project_path)
+
+def build_reopen_stages(project, open_browser=True, open_terminal_window=True, open_editor=True):
+    """Etapas para reabrir um projeto existente: só editor, documentação e terminal"""
+    language, project_path = project["language"], project["path"]
+    lang_config = LANGUAGES.get(language, {})
+    stages = [Stage("structure", lambda r: _reopen_project(project_path), label="📂 Reabrindo projeto...")]
+    if open_editor:
+        stages.append(Stage("vscode", lambda r: open_vscode(r["structure"], language),
+                            deps=["structure"], label="💻 Abrindo VS Code..."))
+    if open_browser and lang_config.get("urls"):
+        stages.append(Stage("browser", lambda r: open_browser_tabs(lang_config["urls"]),
+                            label="🌐 Abrindo documentação..."))
+    if open_terminal_window and language in LANGUAGES:
+        stages.append(Stage("terminal", lambda r: open_terminal(r["structure"], language),
+                            deps=["structure"], label="⌨️ Abrindo terminal...", optional=True))
+    return stages
+
+# ==================== PLANO DE INICIALIZAÇÃO ====================
+#
+# plan_launch() calcula o que uma inicialização vai fazer sem gravar nada nem
+# executar subprocessos: pastas, arquivos (com bytes), comandos, URLs e acertos de
+# cache esperados. O executor recebe o mesmo plano (os mesmos arquivos, inclusive
+# a data do README), o "--dry-run" só o mostra e o lote o usa para achar trabalho
+# repetido antes de abrir os processos.
+
+PLAN_LIST_LIMIT = 15  # linhas por seção em describe() (templates com milhares de arquivos)
+
+class LaunchPlan:
+    """Tudo o que uma inicialização vai fazer (dados simples: pode ir para outro processo)"""
+
+    def __init__(self, language, project_name, base_dir, options):
+        self.language = language
+        self.project_name = project_name
+        self.base_dir = str(base_dir)
+        self.project_path = str(Path(base_dir) / project_name)
+        self.options = options      # argumentos de build_launch_stages (editor, git, ...)
+        self.files = {}             # conteúdo que a etapa "structure" vai gravar
+        self.file_actions = {}      # {caminho: (ação, bytes a gravar)}
+        self.directories = []       # pastas que serão criadas
+        self.subprocesses = []      # [(etapa, comando)]
+        self.urls = []              # [(url, tem cópia local)]
+        self.cache_hits = {}        # {cache: acerto esperado}
+        self.stage_graph = {}       # {etapa: (dependências, segundo plano)}
+        self.idle_stages = []       # etapas que não terão nada a fazer (venv/.git já existem)
+        self.unknown = []           # o que só se sabe executando (nada é sondado no plano)
+        self.warnings = []
+    
+    def build_stages(self, scaffold_report=None):
+        """Etapas que executam exatamente este plano"""
+        return build_launch_stages(self.language, self.project_name, self.base_dir,
+                                   scaffold_report=scaffold_report, files=self.files, **self.options)
+    
+    def counts(self):
+        """{ação: (arquivos, bytes)} dos arquivos do template"""
+        counts = {}
+        for action, size in self.file_actions.values():
+            files, total = counts.get(action, (0, 0))
+            counts[action] = (files + 1, total + size)
+        return counts
+    
+    def bytes_to_write(self):
+        return sum(size for _, size in self.file_actions.values())
+    
+    def estimate(self, history=None):
+        """Tempo esperado até o ambiente pronto e até o fim, pelo histórico das etapas
+
+        Soma as medianas ao longo do caminho crítico do grafo. Etapas ociosas contam
+        como zero; as sem histórico também, e aparecem em "unknown".
+        """
+        history = stage_history(self.language) if history is None else history
+        finish, unknown = {}, []
         
-        # Inicializar Git
-        subprocess.run(["git", "init"], cwd=project_path, shell=True, capture_output=True)
+        def visit(name):
+            if name not in finish:
+                finish[name] = 0.0  # protege contra ciclos
+                deps, _ = self.stage_graph[name]
+                start = max([visit(d) for d in deps if d in self.stage_graph] or [0.0])
+                if name in self.idle_stages:
+                    finish[name] = start
+                else:
+                    if name not in history:
+                        unknown.append(name)
+                    finish[name] = start + history.get(name, 0.0)
+            return finish[name]
         
-        return str(project_path)
-    except Exception as e:
-        raise Exception(f"Erro ao criar projeto: {e}")
-
-def open_vscode(project_path, language):
-    """Abre o VS Code no projeto"""
-    try:
-        vscode_path = CONFIG["vscode_path"]
+        for name in self.stage_graph:
+            visit(name)
+        ready = [finish[name] for name, (_, background) in self.stage_graph.items() if not background]
+        return {"ready_s": max(ready or [0.0]), "total_s": max(finish.values() or [0.0]),
+                "unknown": unknown}
+    
+    def summary(self):
+        """Resumo serializável em JSON (eventos do daemon, lote)"""
+        return {"path": self.project_path, "files": {a: list(c) for a, c in self.counts().items()},
+                "bytes": self.bytes_to_write(), "directories": len(self.directories),
+                "subprocesses": [" ".join(cmd) for _, cmd in self.subprocesses],
+                "cache_hits": self.cache_hits, "unknown": self.unknown, "warnings": self.warnings}
+    
+    def describe(self):
+        """Texto do plano para o --dry-run"""
+        def limited(items):
+            lines = [f"   {item}" for item in items[:PLAN_LIST_LIMIT]]
+            if len(items) > PLAN_LIST_LIMIT:
+                lines.append(f"   ... e mais {len(items) - PLAN_LIST_LIMIT}")
+            return lines
         
-        # Se não encontrou o VS Code, mostrar erro amigável
-        if not vscode_path:
-            raise Exception("VS Code não encontrado!\n\nPor favor:\n1. Instale o VS Code em: https://code.visualstudio.com/\n2. Ou edite o código e defina o caminho manualmente")
+        lines = [f"📋 Plano: {self.language} → {self.project_path}"]
+        if self.directories:
+            lines.append(f"📁 Pastas a criar ({len(self.directories)}):")
+            lines += limited(self.directories)
         
-        # Tentar abrir
-        subprocess.Popen([vscode_path, project_path], stderr=subprocess.PIPE)
+        counts = self.counts()
+        names = {"created": "a criar", "updated": "a atualizar", "skipped": "sem alteração",
+                 "conflicts": "preservados (modificados)"}
+        parts = [f"{counts[a][0]} {names[a]}" for a in names if a in counts]
+        lines.append(f"📄 Arquivos: {', '.join(parts) or 'nenhum'} — {format_size(self.bytes_to_write())} a gravar")
+        lines += limited([f"{'+' if action == 'created' else '~'} {rel} ({format_size(size)})"
+                          for rel, (action, size) in sorted(self.file_actions.items()) if size])
         
-        # Sugerir extensões (opcional)
-        if "extensions" in LANGUAGES[language]:
-            for ext in LANGUAGES[language]["extensions"]:
-                subprocess.Popen([vscode_path, "--install-extension", ext], 
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        raise Exception(f"VS Code não encontrado em: {vscode_path}\n\nInstale em: https://code.visualstudio.com/")
-    except Exception as e:
-        raise Exception(f"Erro ao abrir VS Code: {e}")
+        if self.subprocesses:
+            lines.append(f"⚙️ Comandos ({len(self.subprocesses)}):")
+            lines += limited([f"[{stage}] {' '.join(cmd)}" for stage, cmd in self.subprocesses])
+        if self.urls:
+            lines.append("🌐 Documentação:")
+            lines += limited([f"{url} ({'cópia local' if local else 'rede'})" for url, local in self.urls])
+        if self.cache_hits:
+            lines.append("💾 Caches: " + ", ".join(f"{name} {'✓' if hit else '✗'}"
+                                                  for name, hit in self.cache_hits.items()))
+        if self.unknown:
+            lines.append("❔ Desconhecido até executar: " + ", ".join(self.unknown))
+        for warning in self.warnings:
+            lines.append(f"⚠️ {warning}")
+        return "\n".join(lines)
 
-def open_browser_tabs(urls):
-    """Abre as URLs no navegador"""
-    try:
-        for url in urls:
-            webbrowser.open(url)
-    except Exception as e:
-        raise Exception(f"Erro ao abrir navegador: {e}")
+def stage_history(language=None, limit=200):
+    """Duração mediana (s) de cada etapa nas últimas inicializações
 
-def setup_python_venv(project_path):
-    """Cria ambiente virtual Python"""
+    Usa as da mesma linguagem quando houver; senão, as de todas.
+    """
+    import statistics
+    
     try:
-        venv_path = Path(project_path) / "venv"
-        subprocess.run(["python", "-m", "venv", "venv"], cwd=project_path, shell=True, check=True)
-        return str(venv_path)
-    except Exception as e:
-        raise Exception(f"Erro ao criar venv: {e}")
+        with open(cache_path("launch_history.jsonl"), encoding='utf-8') as f:
+            lines = f.readlines()[-limit:]
+    except OSError:
+        return {}
+    
+    same, every = {}, {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get("name") != "launch":
+            continue
+        for stage, data in record.get("stages", {}).items():
+            every.setdefault(stage, []).append(data["wall_s"])
+            if record.get("language") == language:
+                same.setdefault(stage, []).append(data["wall_s"])
+    return {stage: statistics.median(same.get(stage) or times) for stage, times in every.items()}
 
-def open_terminal(project_path, language):
-    """Abre o terminal no diretório do projeto"""
-    try:
-        commands = LANGUAGES[language].get("terminal_commands", [])
-        
-        if os.name == 'nt':  # Windows
-            # Criar script batch temporário
-            batch_script = f"""@echo off
-cd /d "{project_path}"
-echo ========================================
-echo Ambiente {language} iniciado!
-echo ========================================
-echo.
-"""
-            if LANGUAGES[language].get("venv"):
-                batch_script += "call venv\\Scripts\\activate.bat\necho Ambiente virtual ativado!\necho.\n"
-            
-            for cmd in commands:
-                batch_script += f"{cmd}\n"
-            
-            batch_script += "echo.\necho Pronto para programar!\ncmd /k"
-            
-            batch_path = Path(project_path) / "start_env.bat"
-            batch_path.write_text(batch_script, encoding='utf-8')
-            
-            subprocess.Popen(["cmd", "/c", "start", "cmd", "/k", str(batch_path)], shell=True)
-        else:  # Linux/Mac
-            subprocess.Popen(["gnome-terminal", "--working-directory", project_path])
-    except Exception as e:
-        print(f"Aviso: Não foi possível abrir terminal: {e}")
+def _plan_directories(project_path, paths):
+    """Pastas que não existem e serão criadas para gravar 'paths'"""
+    missing, checked = set(), set()
+    for path in paths:
+        folder = Path(path).parent
+        while folder not in checked and folder != folder.parent:
+            checked.add(folder)
+            if folder.is_dir():
+                break
+            missing.add(folder)
+            folder = folder.parent
+    if not Path(project_path).is_dir():
+        missing.add(Path(project_path))
+    return sorted(str(folder) for folder in missing)
+
+def _plan_files(plan, language, project_path):
+    lang_config = LANGUAGES[language]
+    manifest = load_project_manifest(project_path)
+    report, to_write = classify_files(project_path, plan.files, manifest, create_only=("README.md",))
+    written = [full_path for _, full_path, _, _, _ in to_write]
+    for rel, _, data, _, action in to_write:
+        plan.file_actions[rel] = (action, len(data))
+    
+    if lang_config.get("template_kind") == "pack":
+        pack_report, pack_writes = classify_pack(project_path, read_pack_index(lang_config["template_source"]),
+                                                 manifest)
+        for action, paths in pack_report.items():
+            report[action].extend(paths)
+        for item, full_path, action in pack_writes:
+            plan.file_actions[item["path"]] = (action, item["size"])
+            written.append(full_path)
+    
+    for action, paths in report.items():
+        for rel in paths:
+            plan.file_actions[rel] = (action, 0)
+    plan.directories = _plan_directories(project_path, written)
+
+def _plan_tools(plan, language, project_path):
+    """Comandos e acertos de cache de cada etapa (só consultas, nada é executado)"""
+    lang_config = LANGUAGES[language]
+    options = plan.options
+    stages = plan.stage_graph
+    
+    if "vscode" in stages:
+        vscode_path, known = known_vscode_path()
+        if vscode_path:
+            plan.subprocesses.append(("vscode", [vscode_path, str(project_path)]))
+        elif known:
+            plan.warnings.append("VS Code não encontrado")
+        else:
+            plan.unknown.append("caminho do VS Code")
+            plan.subprocesses.append(("vscode", ["code", str(project_path)]))
+        if "extensions" in stages and vscode_path:
+            entry = load_cache("vscode_extensions.json").get(vscode_path)
+            fresh = bool(entry) and time.time() - entry.get("checked", 0) < CONFIG["extensions_cache_ttl"]
+            plan.cache_hits["extensions"] = fresh
+            if not fresh:
+                plan.subprocesses.append(("extensions", [vscode_path, "--list-extensions"]))
+            installed = set(entry.get("extensions", [])) if fresh else set()
+            missing = [ext for ext in lang_config["extensions"] if ext.lower() not in installed]
+            if missing:
+                cmd = [vscode_path]
+                for ext in missing:
+                    cmd += ["--install-extension", ext]
+                plan.subprocesses.append(("extensions", cmd))
+    
+    venv_path = project_path / "venv"
+    if "venv" in stages and venv_path.exists():
+        plan.idle_stages.append("venv")
+    elif "venv" in stages:
+        # Fora do executável atual, a chave do pool pode exigir rodar o interpretador
+        python = python_interpreter()
+        pool = None
+        if CONFIG["venv_pool_size"] > 0 and (python == sys.executable or python in _venv_pools):
+            pool = get_venv_pool(python)
+        elif CONFIG["venv_pool_size"] > 0:
+            plan.unknown.append("venvs prontos no pool")
+        plan.cache_hits["venv_pool"] = bool(pool and pool.ready_slots())
+        if not plan.cache_hits["venv_pool"]:
+            plan.subprocesses.append(("venv", [python_interpreter(), "-m", "venv", str(venv_path)]))
+    
+    if "git" in stages:
+        git = shutil.which("git")
+        if not git:
+            plan.warnings.append("Git não encontrado no PATH")
+        elif (project_path / ".git").exists():
+            plan.idle_stages.append("git")
+        else:
+            root = git_skeleton_root(git)
+            plan.cache_hits["git_skeleton"] = (root / ".git").is_dir()
+            if not plan.cache_hits["git_skeleton"]:
+                plan.subprocesses.append(("git", [git, "init", "-q", str(root)]))
+            if options.get("git_commit"):
+                plan.subprocesses.append(("git", [git, "fast-import", "--quiet"]))
+                plan.subprocesses.append(("git", [git, "reset", "-q"]))
+    
+    if "dependencies" in stages:
+        files = dict(plan.files)
+        files.update(template_dependency_files(language, plan.files))  # inclui os do .abpack
+        deps = project_dependencies(project_path, language, files)
+        if deps.get("pip") and "venv" in stages:
+            import re
+            wheelhouse = cache_path("wheelhouse")
+            wheels = [p.name.lower() for p in wheelhouse.glob("*")] if wheelhouse.is_dir() else []
+            names = [re.split(r"[<>=!~\[; ]", pkg, 1)[0].lower().replace("-", "_") for pkg in deps["pip"]]
+            plan.cache_hits["wheelhouse"] = all(any(w.startswith(n + "-") for w in wheels) for n in names)
+            plan.subprocesses.append(("dependencies", [venv_python(venv_path), "-m", "pip", "install",
+                                                       "--no-index"] + deps["pip"]))
+        if deps.get("npm"):
+            plan.subprocesses.append(("dependencies", ["npm", "install", "--prefer-offline"]
+                                      + [p for p in deps["npm"] if p != "."]))
+    
+    if "build" in stages:
+        build = lang_config["build"]
+        contents = {rel: file_bytes(plan.files[rel]) for rel in build.get("inputs", []) if rel in plan.files}
+        try:
+            key = build_cache_key(project_path, build, contents=contents)
+            plan.cache_hits["build"] = (cache_path("build") / key / ".complete").exists()
+            if not plan.cache_hits["build"]:
+                plan.subprocesses.append(("build", list(build["command"])))
+        except Exception as e:
+            plan.warnings.append(f"Compilação: {e}")
+    
+    if "browser" in stages:
+        urls = lang_config["urls"]
+        plan.urls = [(url, cached_doc(url) is not None) for url in urls]
+        plan.cache_hits["docs"] = all(local for _, local in plan.urls)
+        browser, known = known_browser()
+        if not known:
+            plan.unknown.append("navegador padrão")
+        plan.subprocesses.append(("browser", [browser or "webbrowser"] + list(urls)))
+    
+    if "terminal" in stages:
+        backend = detect_terminal_backend()
+        if backend["kind"] == "tmux":
+            plan.subprocesses.append(("terminal", [backend["tmux"], "new-window", "-c", str(project_path)]))
+        elif backend["kind"] == "emulator" and backend["emulator"]:
+            plan.subprocesses.append(("terminal", [backend["emulator"][0]]))
+        elif backend["kind"] == "headless":
+            plan.warnings.append("Sem terminal gráfico: o terminal não será aberto")
+        else:
+            plan.subprocesses.append(("terminal", [backend["kind"]]))
+
+@traced
+def plan_launch(language, project_name, base_dir, open_browser=True, open_terminal_window=True,
+                open_editor=True, init_git=True, git_commit=None, warm=True):
+    """Monta o LaunchPlan de uma inicialização sem gravar nada no disco"""
+    if language not in LANGUAGES:
+        raise Exception(f"Linguagem desconhecida: {language!r}")
+    if not project_name:
+        raise Exception("Nome do projeto vazio")
+    
+    options = {"open_browser": open_browser, "open_terminal_window": open_terminal_window,
+               "open_editor": open_editor, "init_git": init_git, "warm": warm,
+               "git_commit": CONFIG["git_initial_commit"] if git_commit is None else git_commit}
+    plan = LaunchPlan(language, project_name, base_dir, options)
+    project_path = Path(plan.project_path)
+    plan.files = project_files(language, project_name)
+    
+    try:
+        _plan_files(plan, language, project_path)
+    except (OSError, ValueError) as e:
+        raise Exception(f"Erro ao planejar o projeto: {e}")
+    plan.stage_graph = {stage.name: (list(stage.deps), stage.background) for stage in plan.build_stages()}
+    _plan_tools(plan, language, project_path)
+    
+    conflicts = [rel for rel, (action, _) in plan.file_actions.items() if action == "conflicts"]
+    if conflicts:
+        plan.warnings.append(f"{len(conflicts)} arquivo(s) modificado(s) por você serão preservados")
+    return plan
 
 # ==================== INTERFACE GRÁFICA ====================
 
+# O tkinter só é importado quando a interface é aberta: o modo de linha de
+# comando funciona em máquinas sem display
+tk = ttk = messagebox = filedialog = scrolledtext = None
+
+def load_tkinter():
+    """Importa o tkinter sob demanda"""
+    global tk, ttk, messagebox, filedialog, scrolledtext
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog, scrolledtext
+
 class DevEnvironmentLauncher:
     def __init__(self, root):
         self.root = root
@@ -397,21 +3468,86 @@ class DevEnvironmentLauncher:
         self.open_browser = tk.BooleanVar(value=True)
         self.open_terminal = tk.BooleanVar(value=True)
         self.init_git = tk.BooleanVar(value=True)
+        self.git_commit = tk.BooleanVar(value=CONFIG["git_initial_commit"])
         
-        self.setup_ui()
+        # A janela é desenhada primeiro; detecções e pré-aquecimento vêm depois
+        self.startup = Tracer("startup")
+        with self.startup.activate(), self.startup.span("setup_ui", category="stage"):
+            self.setup_ui()
+        self.root.bind("<Map>", self.on_first_map)
     
-    def setup_ui(self):
-        # Verificar se VS Code foi encontrado
-        if not CONFIG["vscode_path"]:
-            messagebox.showwarning("⚠️ VS Code não encontrado",
-                                 "VS Code não foi encontrado automaticamente.\n\n"
-                                 "O programa ainda funcionará, mas você precisará:\n"
-                                 "• Instalar o VS Code: https://code.visualstudio.com/\n"
-                                 "• Ou abrir a pasta do projeto manualmente\n\n"
-                                 "Pressione OK para continuar...")
+    def on_first_map(self, event):
+        if event.widget is self.root:
+            self.root.unbind("<Map>")
+            self.root.after_idle(self.on_window_ready)
+    
+    def on_window_ready(self):
+        """Chamado quando a janela já está desenhada e respondendo"""
+        startup_s = process_uptime()
+        self.startup.info["process_to_interactive_s"] = round(startup_s, 4)
+        self.timing_label.config(text=f"🚀 Janela pronta em {startup_s:.2f}s")
+        threading.Thread(target=self.startup.save, daemon=True).start()
+        
+        # A detecção do VS Code roda em segundo plano, sem atrasar a janela
+        self.vscode_probe = start_vscode_discovery()
+        self.root.after(100, self.check_vscode_discovery)
+        
+        # Verifica as ferramentas de todas as linguagens de uma vez
+        self.toolchains = None
+        threading.Thread(target=self.run_toolchain_probe, daemon=True).start()
+        
+        # Deixa venvs prontos para os próximos projetos Python
+        if CONFIG["venv_pool_size"] > 0:
+            get_venv_pool().refill_async()
+        
+        # Documentação espelhada servida localmente enquanto a janela estiver aberta
+        threading.Thread(target=start_docs_server, daemon=True).start()
+    
+    def run_toolchain_probe(self):
+        """Sonda as ferramentas fora da thread do Tk e atualiza os botões depois"""
+        try:
+            toolchains = probe_toolchains()
+        except Exception as e:
+            warn(f"Não foi possível verificar as ferramentas: {e}")
+            return
+        self.root.after(0, self.show_toolchains, toolchains)
+    
+    def show_toolchains(self, toolchains):
+        """Mostra a versão (ou a ausência) da ferramenta em cada botão de linguagem"""
+        self.toolchains = toolchains
+        for language, btn in self.language_buttons.items():
+            info = toolchains.get(language)
+            if not info or not info["versions"]:
+                detail = ""
+            elif info["available"]:
+                detail = info["version"] or "✓"
+            else:
+                detail = "⚠️ não encontrado"
+            btn.config(text=f"{LANGUAGES[language]['icon']} {language}\n{detail}")
+    
+    def check_vscode_discovery(self):
+        if self.vscode_probe.is_alive():
+            self.root.after(100, self.check_vscode_discovery)
+            return
         
+        # Aviso não bloqueante: o programa continua funcionando sem o VS Code
+        if not get_vscode_path():
+            self.show_banner("⚠️ VS Code não foi encontrado automaticamente. Instale em "
+                             "https://code.visualstudio.com/ ou abra a pasta do projeto manualmente.")
+    
+    def show_banner(self, text):
+        """Faixa de aviso abaixo do cabeçalho, que o usuário pode fechar"""
+        banner = tk.Frame(self.root, bg="#fff3cd")
+        tk.Label(banner, text=text, font=("Arial", 9), bg="#fff3cd", fg="#856404",
+                 anchor=tk.W, justify=tk.LEFT, wraplength=700).pack(side=tk.LEFT, fill=tk.X,
+                                                                    expand=True, padx=10, pady=4)
+        tk.Button(banner, text="✕", font=("Arial", 9), bg="#fff3cd", relief=tk.FLAT, bd=0,
+                  cursor="hand2", command=banner.destroy).pack(side=tk.RIGHT, padx=6)
+        banner.pack(fill=tk.X, after=self.header)
+    
+    def setup_ui(self):
         # Header - Mais compacto
-        header = tk.Frame(self.root, bg="#667eea", height=70)
+        header = self.header = tk.Frame(self.root, bg="#667eea", height=70)
         header.pack(fill=tk.X)
         header.pack_propagate(False)
         
@@ -432,15 +3568,17 @@ class DevEnvironmentLauncher:
         lang_frame = tk.Frame(main_frame, bg="#f5f5f5")
         lang_frame.pack(fill=tk.X, pady=(0, 12))
         
+        self.language_buttons = {}
         for idx, (lang, config) in enumerate(LANGUAGES.items()):
-            btn = tk.Button(lang_frame, text=f"{config['icon']} {lang}",
-                          font=("Arial", 10, "bold"), width=13, height=1,
+            btn = tk.Button(lang_frame, text=f"{config['icon']} {lang}\n",
+                          font=("Arial", 10, "bold"), width=13, height=2,
                           bg=config['color'], fg="white",
                           activebackground=config['color'],
                           activeforeground="white",
                           command=lambda l=lang: self.select_language(l),
                           cursor="hand2", relief=tk.RAISED, bd=2)
-            btn.grid(row=idx//3, column=idx%3, padx=4, pady=4, sticky=tk.NSEW, ipady=8)
+            btn.grid(row=idx//3, column=idx%3, padx=4, pady=4, sticky=tk.NSEW, ipady=2)
+            self.language_buttons[lang] = btn
         
         # Configurar grid
         for i in range(3):
@@ -451,9 +3589,16 @@ class DevEnvironmentLauncher:
                              font=("Arial", 10, "bold"), bg="#f5f5f5")
         name_label.pack(anchor=tk.W, pady=(8, 3))
         
-        name_entry = tk.Entry(main_frame, textvariable=self.project_name, 
+        name_frame = tk.Frame(main_frame, bg="#f5f5f5")
+        name_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        name_entry = tk.Entry(name_frame, textvariable=self.project_name, 
                              font=("Arial", 10), width=50)
-        name_entry.pack(fill=tk.X, pady=(0, 10), ipady=3)
+        name_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, ipady=3)
+        
+        recent_btn = tk.Button(name_frame, text="📂 Recentes", font=("Arial", 9),
+                               command=self.show_recent_projects)
+        recent_btn.pack(side=tk.LEFT, padx=(4, 0))
         
         # Diretório base - Mais compacto
         dir_label = tk.Label(main_frame, text="Pasta de projetos:", 
@@ -490,6 +3635,10 @@ class DevEnvironmentLauncher:
                       variable=self.init_git, bg="#f5f5f5", 
                       font=("Arial", 9)).pack(anchor=tk.W, padx=12, pady=4)
         
+        tk.Checkbutton(options_frame, text="Fazer commit inicial", 
+                      variable=self.git_commit, bg="#f5f5f5", 
+                      font=("Arial", 9)).pack(anchor=tk.W, padx=32, pady=(0, 4))
+        
         # BOTÃO DE AÇÃO - GRANDE E VISÍVEL
         btn_frame = tk.Frame(main_frame, bg="#f5f5f5")
         btn_frame.pack(fill=tk.X, pady=(12, 8))
@@ -516,11 +3665,99 @@ class DevEnvironmentLauncher:
                                      bg="#f5f5f5", 
                                      fg="#666")
         self.status_label.pack(pady=(8, 0))
+        
+        # Duração de cada etapa da última inicialização
+        self.timing_label = tk.Label(main_frame, text="", font=("Arial", 8), 
+                                     bg="#f5f5f5", fg="#999")
+        self.timing_label.pack(pady=(2, 0))
+        
+        # Processos abertos pelo programa que ainda rodam ou falharam (clique para detalhes)
+        self.process_label = tk.Label(main_frame, text="", font=("Arial", 8),
+                                      bg="#f5f5f5", fg="#999", cursor="hand2")
+        self.process_label.pack(pady=(2, 0))
+        self.process_label.bind("<Button-1>", lambda event: self.show_process_details())
+        self.root.after(1000, self.refresh_processes)
+    
+    def refresh_processes(self):
+        """Atualiza a lista de processos filhos a cada segundo"""
+        children = supervisor.active()
+        text = "  ".join(child.describe() for child in children[-6:])
+        self.process_label.config(text=text, fg="#F44336" if any(c.state != "running" for c in children) else "#999")
+        self.root.after(1000, self.refresh_processes)
+    
+    def show_process_details(self):
+        children = supervisor.active()
+        if not children:
+            return
+        lines = []
+        for child in children:
+            lines.append(f"{child.describe()}  pid {child.pid or '-'}\n  {' '.join(child.args)}")
+            lines.extend(f"  {line}" for line in child.stderr_tail[-5:])
+        lines.append(f"\nLog completo: {cache_path('processes.log')}")
+        messagebox.showinfo("Processos", "\n".join(lines))
+    
+    def show_recent_projects(self):
+        """Janela com a lista pesquisável de projetos recentes"""
+        window = tk.Toplevel(self.root)
+        window.title("Projetos recentes")
+        window.geometry("560x380")
+        window.transient(self.root)
+        
+        query = tk.StringVar()
+        tk.Entry(window, textvariable=query, font=("Arial", 10)).pack(fill=tk.X, padx=10, pady=(10, 4), ipady=3)
+        listbox = tk.Listbox(window, font=("Arial", 10), activestyle=tk.NONE)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10)
+        projects = []
+        
+        def refresh(*args):
+            projects[:] = ProjectIndex().recent(query.get(), limit=100)
+            listbox.delete(0, tk.END)
+            for project in projects:
+                icon = LANGUAGES.get(project["language"], {}).get("icon", "📁")
+                listbox.insert(tk.END, f"{icon} {project['name']}  —  {project['path']}")
+        
+        def crawl():
+            try:
+                ProjectIndex().crawl(self.base_dir.get())
+            except Exception as e:
+                warn(f"Não foi possível procurar projetos: {e}")
+            self.root.after(0, lambda: window.winfo_exists() and refresh())
+        
+        def reopen(*args):
+            selection = listbox.curselection()
+            if not selection:
+                return
+            project = projects[selection[0]]
+            window.destroy()
+            self.reopen_project(project)
+        
+        query.trace_add("write", refresh)
+        listbox.bind("<Double-Button-1>", reopen)
+        tk.Button(window, text="📂 Reabrir", font=("Arial", 10, "bold"), bg="#4CAF50", fg="white",
+                  command=reopen).pack(pady=8)
+        refresh()
+        threading.Thread(target=crawl, daemon=True).start()  # descobre pastas novas sem travar
+    
+    def reopen_project(self, project):
+        """Abre editor, documentação e terminal de um projeto existente, sem recriar nada"""
+        if project["language"] not in LANGUAGES:
+            messagebox.showerror("Erro", f"Linguagem desconhecida: {project['language']}")
+            return
+        self.launch_btn.config(state=tk.DISABLED, text="⏳ ABRINDO...", bg="#FF9800")
+        stages = build_reopen_stages(project, open_browser=self.open_browser.get(),
+                                     open_terminal_window=self.open_terminal.get())
+        self.start_launch(project["language"], project["name"], stages, reopen=True)
     
     def select_language(self, language):
         self.selected_language.set(language)
         self.launch_btn.config(state=tk.NORMAL, bg="#4CAF50")
         self.status_label.config(text=f"✓ {language} selecionado - Pronto para iniciar!", fg="#4CAF50")
+        
+        info = (getattr(self, "toolchains", None) or {}).get(language)
+        if info and not info["available"]:
+            missing = [c.split()[0] for c, v in info["versions"].items() if v is None]
+            self.status_label.config(text=f"⚠️ {language}: {', '.join(missing)} não encontrado no PATH",
+                                     fg="#FF9800")
     
     def choose_directory(self):
         directory = filedialog.askdirectory(initialdir=self.base_dir.get())
@@ -537,55 +3774,834 @@ class DevEnvironmentLauncher:
             return
         
         self.launch_btn.config(state=tk.DISABLED, text="⏳ INICIANDO...", bg="#FF9800")
-        self.root.update()
         
+        language, project_name = self.selected_language.get(), self.project_name.get()
+        self.scaffold_report = {}
+        # Variáveis do Tk são lidas aqui; o plano (que lê todos os arquivos do
+        # template) é montado na thread das etapas, sem travar a janela
+        options = {"open_browser": self.open_browser.get(), "open_terminal_window": self.open_terminal.get(),
+                   "init_git": self.init_git.get(), "git_commit": self.git_commit.get()}
+        base_dir, report = self.base_dir.get(), self.scaffold_report
+        
+        def prepare(events):
+            plan = plan_launch(language, project_name, base_dir, **options)
+            events.emit("plan", estimate=plan.estimate(), bytes=plan.bytes_to_write())
+            return plan.build_stages(report)
+        
+        self.start_launch(language, project_name, prepare)
+    
+    def start_launch(self, language, project_name, stages, reopen=False):
+        """Executa as etapas em segundo plano e acompanha o progresso na interface
+
+        'stages' é a lista de etapas ou uma função (bus) -> etapas, chamada na
+        thread de segundo plano (ex.: para montar o LaunchPlan).
+        """
+        # As etapas rodam fora da thread do Tk: os eventos chegam por uma fila
+        launch = {
+            "language": language,
+            "reopen": reopen,
+            "events": queue.Queue(),
+            "bus": EventBus(),
+            "running": [],
+            "labels": {},
+            "results": {},
+            "errors": {},
+            "optional": set(),
+            "ready": False,
+            "tracer": Tracer("launch", language=language, project=project_name),
+        }
+        launch["bus"].subscribe(launch["events"].put)
+        threading.Thread(target=self.run_launch, args=(launch, stages), daemon=True).start()
+        self.root.after(50, self.poll_events, launch)
+    
+    def run_launch(self, launch, stages):
+        """Monta (se preciso) e executa o grafo de etapas em segundo plano"""
         try:
-            language = self.selected_language.get()
-            project_name = self.project_name.get()
-            base_dir = self.base_dir.get()
-            
-            # Criar projeto
-            self.status_label.config(text="📁 Criando estrutura do projeto...", fg="#2196F3")
-            self.root.update()
-            project_path = create_project_structure(language, project_name, base_dir)
-            
-            # Ambiente virtual Python
-            if LANGUAGES[language].get("venv"):
-                self.status_label.config(text="🐍 Criando ambiente virtual Python...", fg="#2196F3")
-                self.root.update()
-                setup_python_venv(project_path)
-            
-            # Abrir VS Code
-            self.status_label.config(text="💻 Abrindo VS Code...", fg="#2196F3")
-            self.root.update()
-            open_vscode(project_path, language)
-            
-            # Abrir navegador
-            if self.open_browser.get():
-                self.status_label.config(text="🌐 Abrindo documentação...", fg="#2196F3")
-                self.root.update()
-                open_browser_tabs(LANGUAGES[language]["urls"])
-            
-            # Abrir terminal
-            if self.open_terminal.get():
-                self.status_label.config(text="⌨️ Abrindo terminal...", fg="#2196F3")
-                self.root.update()
-                open_terminal(project_path, language)
-            
-            messagebox.showinfo("✅ Sucesso!", 
-                              f"Ambiente {language} iniciado com sucesso!\n\n📂 Projeto criado em:\n{project_path}")
-            
-            self.launch_btn.config(state=tk.NORMAL, text="🚀 INICIAR AMBIENTE", bg="#4CAF50")
-            self.status_label.config(text=f"✅ Ambiente {language} pronto para usar!", fg="#4CAF50")
-            
+            if callable(stages):
+                stages = stages(launch["bus"])
+            # Preenchidos antes do primeiro evento das etapas (a fila ordena o acesso)
+            launch["labels"].update((stage.name, stage.label) for stage in stages)
+            launch["optional"].update(stage.name for stage in stages if stage.optional)
+            run_stage_graph(stages, events=launch["bus"], tracer=launch["tracer"])
         except Exception as e:
-            messagebox.showerror("❌ Erro", f"Erro ao iniciar ambiente:\n\n{str(e)}")
-            self.launch_btn.config(state=tk.NORMAL, text="🚀 INICIAR AMBIENTE", bg="#4CAF50")
+            launch["errors"]["pipeline"] = e
+            launch["bus"].emit("end", ok=False, errors={"pipeline": str(e)})
+        launch["tracer"].save()
+        launch["events"].put(None)  # fim: o trace já foi gravado
+        launch["bus"].close()
+    
+    def poll_events(self, launch):
+        """Consome os eventos das etapas na thread do Tk"""
+        try:
+            while True:
+                event = launch["events"].get_nowait()
+                if event is None:
+                    if not launch["ready"]:
+                        self.finish_launch(launch)
+                    self.finish_background(launch)
+                    self.timing_label.config(text=launch["tracer"].breakdown())
+                    return
+                self.handle_stage_event(launch, event)
+        except queue.Empty:
+            pass
+        self.root.after(50, self.poll_events, launch)
+    
+    def handle_stage_event(self, launch, event):
+        kind, name = event.kind, event.stage
+        if kind == "plan":
+            self.timing_label.config(text=f"📋 Estimativa: pronto em ~{event.data['estimate']['ready_s']:.1f}s, "
+                                          f"{format_size(event.data['bytes'])} a gravar")
+            return
+        if kind == "progress":
+            self.status_label.config(text=f"{launch['labels'].get(name, name)} {event.data['text']}",
+                                     fg="#2196F3")
+            return
+        if kind == "warning" and not launch["ready"]:
+            self.status_label.config(text=f"⚠️ {event.data['text']}", fg="#FF9800")
+            return
+        
+        if kind == "stage_start":
+            launch["running"].append(name)
+        elif kind == "stage_end":
+            if name in launch["running"]:
+                launch["running"].remove(name)
+            if event.data["status"] == "done":
+                launch["results"][name] = event.data["result"]
+            else:
+                launch["errors"][name] = event.data["error"]
+                if event.data["status"] == "error" and event.data["optional"]:
+                    warn(f"{event.data['label']} {event.data['error']}")
+        elif kind == "ready" and not launch["ready"]:
+            # Etapas em segundo plano (ex.: extensões) não atrasam o "pronto"
+            self.finish_launch(launch)
+            return
+        
+        if launch["running"] and kind in ("stage_start", "stage_end"):
+            text = "  |  ".join(launch["labels"].get(n, n) for n in launch["running"])
+            self.status_label.config(text=text, fg="#2196F3")
+    
+    def finish_launch(self, launch):
+        launch["ready"] = True
+        language, results, errors = launch["language"], launch["results"], launch["errors"]
+        self.launch_btn.config(state=tk.NORMAL, text="🚀 INICIAR AMBIENTE", bg="#4CAF50")
+        
+        # Etapas opcionais (terminal) não impedem o ambiente de ser considerado pronto
+        failures = [e for name, e in errors.items()
+                    if e is not None and name not in launch["optional"]]
+        if failures:
+            messagebox.showerror("❌ Erro", f"Erro ao iniciar ambiente:\n\n{str(failures[0])}")
             self.status_label.config(text="❌ Erro ao iniciar ambiente", fg="red")
+            return
+        
+        project_path = results.get("structure")
+        if launch.get("reopen"):
+            self.status_label.config(text=f"✅ Projeto reaberto: {project_path}", fg="#4CAF50")
+            return
+        
+        report = self.scaffold_report
+        files_info = (f"📄 {len(report.get('created', []))} arquivo(s) criado(s), "
+                      f"{len(report.get('updated', []))} atualizado(s), "
+                      f"{len(report.get('skipped', []))} sem alteração")
+        if report.get("conflicts"):
+            files_info += ("\n⚠️ Preservados (modificados por você): "
+                           + ", ".join(report["conflicts"]))
+        
+        self.status_label.config(text=f"✅ Ambiente {language} pronto para usar!", fg="#4CAF50")
+        messagebox.showinfo("✅ Sucesso!", 
+                          f"Ambiente {language} iniciado com sucesso!\n\n📂 Projeto criado em:\n{project_path}\n\n{files_info}")
+    
+    def finish_background(self, launch):
+        """Mostra o resultado das etapas em segundo plano que terminaram depois do ambiente pronto"""
+        results, errors = launch["results"], launch["errors"]
+        warnings, messages = [], []
+        
+        if errors.get("extensions") is not None:
+            warnings.append(f"Extensões: {errors['extensions']}")
+        elif results.get("extensions"):
+            messages.append("🧩 Extensões instaladas: " + ", ".join(results["extensions"]))
+        
+        if errors.get("dependencies") is not None:
+            warnings.append(f"Dependências: {errors['dependencies']}")
+        elif results.get("dependencies"):
+            messages.append("📦 Dependências: " + ", ".join(
+                f"{tool} ({count})" for tool, count in results["dependencies"].items()))
+        
+        if errors.get("build") is not None:
+            warnings.append(f"Compilação: {errors['build']}")
+        elif results.get("build"):
+            build = results["build"]
+            origin = "cache" if build["cached"] else "compilado"
+            messages.append(f"🔨 Build em {build['seconds']:.2f}s ({origin}, "
+                            f"{build['hits']}/{build['hits'] + build['misses']} acertos no cache)")
+        
+        if warnings:
+            self.status_label.config(text="⚠️ " + " | ".join(warnings), fg="#FF9800")
+        elif messages:
+            self.status_label.config(text="  |  ".join(messages), fg="#4CAF50")
+
+# ==================== DAEMON (SOCKET UNIX) ====================
+#
+# "python abridor_ambiente.py daemon" mantém um processo residente com o índice
+# de templates, a detecção do VS Code, a sondagem das ferramentas, o .git modelo
+# e o pool de venvs já aquecidos. "python abridor_ambiente.py create" envia o
+# pedido pelo socket e recebe o progresso das etapas como linhas JSON.
+
+DAEMON_SOCKET = "daemon.sock"
+
+def daemon_socket_path():
+    """Caminho do socket do daemon dentro da pasta de cache"""
+    return cache_path(DAEMON_SOCKET)
+
+def _json_safe(value):
+    """O valor, se for serializável em JSON; senão sua representação em texto"""
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return str(value)
+
+def run_launch_request(request, send):
+    """Executa um pedido 'create' ou 'reopen', entregando cada evento (dicionário) a 'send'
+
+    Os eventos são os do EventBus (ProgressEvent.to_dict), mais "plan" antes das
+    etapas e "finished" no fim, com o caminho, os erros e o relatório dos arquivos.
+    """
+    options = request.get("options", {})
+    scaffold_report = {}
+    events = EventBus()
+    events.subscribe(lambda event: send(event.to_dict()))
+    if request.get("op") == "reopen":
+        project = find_project(request.get("project") or "")
+        if not project:
+            raise Exception(f"Projeto não encontrado: {request.get('project')!r}")
+        language, name = project["language"], project["name"]
+        stages = build_reopen_stages(project, open_browser=options.get("browser", True),
+                                     open_terminal_window=options.get("terminal", True),
+                                     open_editor=options.get("editor", True))
+    else:
+        language, name = request.get("language"), request.get("name")
+        plan = plan_launch(language, name, request.get("base_dir") or CONFIG["base_projects_dir"],
+                           open_browser=options.get("browser", True),
+                           open_terminal_window=options.get("terminal", True),
+                           open_editor=options.get("editor", True),
+                           init_git=options.get("git", True),
+                           git_commit=options.get("commit"))
+        events.emit("plan", summary=plan.summary(), estimate=plan.estimate())
+        stages = plan.build_stages(scaffold_report)
+    
+    optional = {stage.name for stage in stages if stage.optional}
+    tracer = Tracer("launch", language=language, project=name)
+    results, errors = run_stage_graph(stages, events=events, tracer=tracer)
+    tracer.save()
+    failed = [stage for stage, e in errors.items() if e is not None and stage not in optional]
+    events.emit("finished", ok=not failed, path=results.get("structure"),
+                errors={stage: str(e) for stage, e in errors.items() if e is not None},
+                files=scaffold_report, seconds=time.perf_counter() - events.t0)
+    events.close()
+
+def daemon_alive(path=None):
+    """True se há um daemon aceitando conexões no socket"""
+    import socket
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path or daemon_socket_path()))
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+def _read_events(client):
+    with client, client.makefile("rb") as reader:
+        for line in reader:
+            yield json.loads(line)
+
+def daemon_request(request, path=None):
+    """Envia um pedido ao daemon e retorna um iterador com os eventos conforme chegam
+
+    Levanta OSError se não houver daemon rodando.
+    """
+    import socket
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path or daemon_socket_path()))
+        client.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode('utf-8'))
+    except OSError:
+        client.close()
+        raise
+    return _read_events(client)
+
+class LauncherDaemon:
+    """Processo residente que atende pedidos do socket em um pool de threads limitado"""
+
+    def __init__(self, path=None, workers=4):
+        self.path = Path(path or daemon_socket_path())
+        self.workers = workers
+        self.server = None
+        self.stopping = threading.Event()
+    
+    def warm_up(self):
+        """Carrega em memória o que cada execução a frio refaz"""
+        mark_resident_process()
+        load_template_registry()
+        start_vscode_discovery()
+        threading.Thread(target=probe_toolchains, daemon=True).start()
+        git = shutil.which("git")
+        if git:
+            threading.Thread(target=git_skeleton, args=(git,), daemon=True).start()
+        if CONFIG["venv_pool_size"] > 0:
+            get_venv_pool().refill_async()
+        start_docs_server()
+    
+    def bind(self):
+        import socket
+        if not hasattr(socket, "AF_UNIX"):
+            raise Exception("Sockets Unix não são suportados neste sistema")
+        if self.path.exists():
+            if daemon_alive(self.path):
+                raise Exception(f"Já existe um daemon rodando em {self.path}")
+            self.path.unlink()  # socket de um daemon que não terminou direito
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous = os.umask(0o177)  # só o próprio usuário conecta
+        try:
+            server.bind(str(self.path))
+        finally:
+            os.umask(previous)
+        server.listen(64)
+        server.settimeout(0.5)  # permite verificar o pedido de parada
+        self.server = server
+    
+    def serve_forever(self):
+        """Atende conexões até receber o pedido 'shutdown'"""
+        import socket
+        if self.server is None:
+            self.bind()
+        self.warm_up()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while not self.stopping.is_set():
+                    try:
+                        conn, _ = self.server.accept()
+                    except socket.timeout:
+                        continue
+                    conn.settimeout(None)
+                    pool.submit(self.handle, conn)
+        finally:
+            self.close()
+    
+    def handle(self, conn):
+        """Atende um pedido: ping, shutdown, create ou reopen"""
+        def send(event):
+            try:
+                conn.sendall((json.dumps(event, ensure_ascii=False) + "\n").encode('utf-8'))
+            except OSError:
+                pass  # o cliente desconectou; o projeto continua sendo criado
+        
+        with conn, conn.makefile("rb") as reader:
+            try:
+                request = json.loads(reader.readline() or b"{}")
+                op = request.get("op")
+                if op == "ping":
+                    send({"event": "pong", "pid": os.getpid(), "uptime": process_uptime()})
+                elif op == "shutdown":
+                    self.stopping.set()
+                    send({"event": "bye"})
+                elif op in ("create", "reopen"):
+                    run_launch_request(request, send)
+                else:
+                    raise Exception(f"Operação desconhecida: {op!r}")
+            except Exception as e:
+                send({"event": "finished", "ok": False, "errors": {"request": str(e)}})
+    
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+def cmd_daemon(args):
+    if args.stop:
+        try:
+            for event in daemon_request({"op": "shutdown"}):
+                pass
+        except OSError:
+            print("Nenhum daemon rodando.")
+            return 1
+        print("🛑 Daemon encerrado.")
+        return 0
+    
+    daemon = LauncherDaemon(workers=args.workers)
+    try:
+        daemon.bind()
+    except Exception as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🛰️ Daemon ouvindo em {daemon.path} (pid {os.getpid()}, {args.workers} pedidos simultâneos)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.close()
+    return 0
+
+def cmd_create(args):
+    base_dir = str(Path(args.base_dir or CONFIG["base_projects_dir"]).expanduser().resolve())
+    options = {"browser": not args.no_browser, "terminal": not args.no_terminal,
+               "editor": not args.no_editor, "git": not args.no_git, "commit": args.commit}
+    if args.dry_run:
+        load_template_registry()
+        try:
+            plan = plan_launch(args.language, args.name, base_dir, open_browser=options["browser"],
+                               open_terminal_window=options["terminal"], open_editor=options["editor"],
+                               init_git=options["git"], git_commit=options["commit"])
+        except Exception as e:
+            print(f"❌ {e}")
+            return 1
+        estimate = plan.estimate()
+        print(plan.describe())
+        print(f"⏱️ Estimativa: pronto em ~{estimate['ready_s']:.2f}s, tudo em ~{estimate['total_s']:.2f}s"
+              + (f" (sem histórico: {', '.join(estimate['unknown'])})" if estimate["unknown"] else ""))
+        return 0
+    
+    request = {"op": "create", "language": args.language, "name": args.name,
+               "base_dir": base_dir, "options": options}
+    return run_client_request(request, use_daemon=not args.no_daemon, json_events=args.json_events)
+
+def cmd_reopen(args):
+    project = args.project
+    if os.path.isdir(project):
+        project = str(Path(project).resolve())
+    request = {
+        "op": "reopen",
+        "project": project,
+        "options": {"browser": not args.no_browser, "terminal": not args.no_terminal,
+                    "editor": not args.no_editor},
+    }
+    return run_client_request(request, use_daemon=not args.no_daemon, json_events=args.json_events)
+
+def cmd_recent(args):
+    index = ProjectIndex()
+    index.crawl()
+    projects = index.recent(args.query or "", limit=args.limit)
+    if not projects:
+        print("Nenhum projeto encontrado.")
+        return 1
+    for project in projects:
+        when = project["last_opened"] or project["created"]
+        stamp = datetime.fromtimestamp(when).strftime("%d/%m/%Y %H:%M") if when else "-"
+        icon = LANGUAGES.get(project["language"], {}).get("icon", "📁")
+        print(f"{icon} {project['name']:<30} {project['language'] or '?':<14} {stamp}  {project['path']}")
+    return 0
+
+def run_client_request(request, use_daemon=True, json_events=False):
+    """Envia o pedido ao daemon (ou executa aqui, se não houver) mostrando o progresso
+
+    Com 'json_events', escreve cada evento como uma linha JSON na saída padrão.
+    """
+    start = time.perf_counter()
+    finished = {"ok": False}
+    labels = {}
+    
+    def show(event):
+        kind = event.get("event")
+        if kind == "finished":
+            finished.update(event)
+        if json_events:
+            print(json.dumps(event, ensure_ascii=False), flush=True)
+        elif kind == "plan":
+            files = event["summary"]["files"]
+            print(f"📋 {files.get('created', [0])[0]} arquivo(s) a criar, "
+                  f"{format_size(event['summary']['bytes'])} a gravar; "
+                  f"estimativa: pronto em ~{event['estimate']['ready_s']:.2f}s")
+        elif kind == "stage_start":
+            labels[event["stage"]] = event["label"]
+            print(f"  {event['label']}")
+        elif kind == "progress":
+            print(f"  {labels.get(event['stage'], event['stage'])} {event['text']}")
+        elif kind == "warning":
+            print(f"  ⚠️ {event['text']}")
+        elif kind == "stage_end" and event["status"] == "error":
+            print(f"  {'⚠️' if event['optional'] else '❌'} {event['stage']}: {event['error']}")
+        elif kind == "ready" and event.get("ok", True):
+            print(f"🚀 Ambiente pronto em {time.perf_counter() - start:.2f}s")
+        elif kind == "ready":
+            print(f"❌ Etapas principais concluídas com erro em {time.perf_counter() - start:.2f}s")
+    
+    events = None
+    if use_daemon:
+        try:
+            events = daemon_request(request)
+        except OSError:
+            events = None  # sem daemon: executa neste processo
+    try:
+        if events is None:
+            load_template_registry()
+            run_launch_request(request, show)
+        else:
+            for event in events:
+                show(event)
+    except Exception as e:
+        finished["errors"] = {"request": str(e)}
+        if json_events:
+            print(json.dumps({"event": "finished", "ok": False, "errors": finished["errors"]},
+                             ensure_ascii=False))
+    
+    if json_events:
+        return 0 if finished["ok"] else 1
+    if finished["ok"]:
+        print(f"✅ {finished['path']} ({time.perf_counter() - start:.2f}s)")
+        return 0
+    for stage, error in finished.get("errors", {}).items():
+        print(f"❌ {stage}: {error}")
+    return 1
+
+def cmd_docs(args):
+    load_template_registry()
+    if args.action == "import":
+        if not args.targets:
+            print("Informe o arquivo .zip/.tar.gz com urls.json")
+            return 2
+        try:
+            count = sum(import_docs_archive(archive) for archive in args.targets)
+        except Exception as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📚 {count} página(s) importada(s)")
+        return 0
+    
+    if args.action == "serve":
+        base = start_docs_server()
+        print(f"📚 Servindo o espelho em {base}/doc?url=<endereço> (Ctrl+C para sair)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            return 0
+    
+    languages = args.targets or list(LANGUAGES)
+    unknown = [lang for lang in languages if lang not in LANGUAGES]
+    if unknown:
+        print(f"Linguagens desconhecidas: {', '.join(unknown)}")
+        return 2
+    urls = list(dict.fromkeys(url for lang in languages for url in LANGUAGES[lang].get("urls", [])))
+    
+    if args.action == "mirror":
+        failures = {url: error for url, error in mirror_docs(urls).items() if error}
+        for url, error in failures.items():
+            print(f"❌ {url}: {error}")
+        print(f"📚 {len(urls) - len(failures)} de {len(urls)} página(s) no espelho")
+        return 1 if failures else 0
+    
+    for url in urls:
+        entry = cached_doc(url)
+        stamp = datetime.fromtimestamp(entry["fetched"]).strftime("%d/%m/%Y %H:%M") if entry else ""
+        print(f"{'✅' if entry else '  '} {url}  {stamp}")
+    return 0
+
+def cmd_du(args):
+    root = Path(args.root or CONFIG["base_projects_dir"]).expanduser()
+    if not root.is_dir():
+        print(f"❌ Pasta não encontrada: {root}")
+        return 1
+    
+    start = time.perf_counter()
+    projects = scan_projects(root, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    files = sum(p["files"] for p in projects)
+    
+    for project in projects[:args.limit]:
+        stamp = datetime.fromtimestamp(project["last_modified"]).strftime("%d/%m/%Y")
+        venv = f"venv {format_size(project['venv_bytes'])}" if project["venv_bytes"] else ""
+        print(f"{format_size(project['bytes']):>10}  {venv:<14} {stamp}  {project['idle_days']:>5.0f}d  "
+              f"{project['name']}")
+    total = sum(p["bytes"] for p in projects)
+    venvs = sum(p["venv_bytes"] for p in projects)
+    print(f"\n{len(projects)} pasta(s), {format_size(total)} (venvs: {format_size(venvs)}), "
+          f"{files} arquivos lidos em {elapsed:.2f}s ({files / elapsed if elapsed else 0:.0f} arquivos/s)")
+    
+    if args.idle_days is None:
+        return 0
+    if not (args.archive or args.remove):
+        idle = select_idle_projects(projects, args.idle_days)
+        unmanaged = [p for p in projects if p["language"] and not p["managed"] and p["idle_days"] > args.idle_days]
+        print(f"{len(idle)} projeto(s) parados há mais de {args.idle_days} dias "
+              f"({format_size(sum(p['bytes'] for p in idle))}); use --archive PASTA ou --remove")
+        if unmanaged:
+            print(f"{len(unmanaged)} pasta(s) parecidas com projetos, mas sem {PROJECT_MANIFEST}, "
+                  "não serão arquivadas nem removidas")
+        return 0
+    
+    results = archive_idle_projects(projects, args.idle_days, archive_dir=args.archive, workers=args.processes)
+    for path, archive, error in results:
+        if error:
+            print(f"❌ {Path(path).name}: {error}")
+        else:
+            print(f"📦 {Path(path).name} -> {archive}" if archive else f"🗑️ {Path(path).name} removido")
+    return 1 if any(error for _, _, error in results) else 0
+
+# ==================== MODO LOTE (LINHA DE COMANDO) ====================
+
+def load_manifest(path):
+    """Lê o manifesto de projetos (JSON ou CSV com as colunas language, name, base_dir e, opcional, git)
+
+    Linhas malformadas não interrompem o lote: voltam com a chave "error".
+    """
+    import csv
+    
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        rows = data.get("projects", []) if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        raise Exception(f"Manifesto inválido: esperava uma lista de projetos em {path.name}")
+    
+    def text(value):
+        return "" if value is None else str(value).strip()
+    
+    projects = []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            projects.append({"language": "", "name": "", "base_dir": CONFIG["base_projects_dir"], "git": False,
+                             "error": f"linha {number} malformada: {row!r}"})
+            continue
+        projects.append({
+            "language": text(row.get("language")),
+            "name": text(row.get("name")),
+            "base_dir": text(row.get("base_dir")) or CONFIG["base_projects_dir"],
+            "git": text(row.get("git", "true")).lower() not in ("0", "false", "no", "nao", "não"),
+        })
+    return projects
+
+def _init_batch_worker(slots):
+    """Inicializa um processo do pool com o limite de subprocessos compartilhado"""
+    global _subprocess_slots
+    _subprocess_slots = slots
+    load_template_registry()  # necessário quando os processos não são criados com fork
+
+def provision_project(row, git_commit=False, plan=None):
+    """Cria um projeto do manifesto (estrutura, Git e venv), medindo cada etapa
+
+    Com o 'plan' (feito no processo principal), grava os arquivos já calculados.
+    """
+    result = dict(row, path=None, error=None, timings={}, files={})
+    start = time.perf_counter()
+    try:
+        if row["language"] not in LANGUAGES:
+            raise Exception(f"Linguagem desconhecida: {row['language']!r}")
+        if not row["name"]:
+            raise Exception("Nome do projeto vazio")
+        
+        t = time.perf_counter()
+        result["path"] = create_project_structure(row["language"], row["name"], row["base_dir"],
+                                                  report=result["files"], files=plan.files if plan else None)
+        result["timings"]["structure"] = time.perf_counter() - t
+        
+        if row.get("git", True):
+            t = time.perf_counter()
+            init_git_repo(result["path"], scaffolded_files(result["files"]) if git_commit else None)
+            result["timings"]["git"] = time.perf_counter() - t
+        
+        if LANGUAGES[row["language"]].get("venv"):
+            t = time.perf_counter()
+            # No lote o pool não é reabastecido por cada processo: evita criar venvs em paralelo à toa
+            setup_python_venv(result["path"], refill=False)
+            result["timings"]["venv"] = time.perf_counter() - t
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def plan_batch(projects, git_commit=False):
+    """Planeja todas as linhas do manifesto antes de executar
+
+    Retorna ([(linha, plano)], [resultados com erro]). Linhas inválidas ou que
+    apontam para a mesma pasta de outra linha falham aqui, sem abrir processos.
+    """
+    planned, rejected, seen = [], [], {}
+    for number, row in enumerate(projects, start=1):
+        try:
+            if row.get("error"):
+                raise Exception(row["error"])
+            plan = plan_launch(row["language"], row["name"], row["base_dir"], open_browser=False,
+                               open_terminal_window=False, open_editor=False,
+                               init_git=row.get("git", True), git_commit=git_commit, warm=False)
+            key = os.path.normcase(os.path.realpath(plan.project_path))
+            if key in seen:
+                raise Exception(f"repetido no manifesto (mesma pasta da linha {seen[key]})")
+            seen[key] = number
+            planned.append((row, plan))
+        except Exception as e:
+            rejected.append(dict(row, path=None, error=str(e), timings={}, files={}, seconds=0.0))
+    return planned, rejected
+
+def _prepare_shared_work(plans):
+    """Gera uma vez, no processo principal, o que todos os projetos compartilham"""
+    git = shutil.which("git")
+    if git and any("git_skeleton" in plan.cache_hits for plan in plans):
+        try:
+            git_skeleton(git)
+        except (OSError, subprocess.SubprocessError) as e:
+            warn(f"Não foi possível gerar o .git modelo: {e}")
+    if any("venv" in plan.stage_graph for plan in plans):
+        interpreter_key(python_interpreter())  # fica no cache para os processos do lote
+
+def run_batch(projects, workers=None, max_subprocesses=4, git_commit=False, report=print):
+    """Provisiona vários projetos em paralelo; a falha de um não interrompe os demais"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = workers or os.cpu_count() or 1
+    slots = multiprocessing.BoundedSemaphore(max(1, max_subprocesses))
+    start = time.perf_counter()
+    
+    planned, results = plan_batch(projects, git_commit)
+    plans = [plan for _, plan in planned]
+    to_create = sum(plan.counts().get("created", (0, 0))[0] for plan in plans)
+    report(f"📋 {len(plans)} projeto(s) planejado(s): {to_create} arquivo(s) a criar, "
+           f"{format_size(sum(plan.bytes_to_write() for plan in plans))} a gravar, "
+           f"{len(results)} recusado(s)")
+    for result in results:
+        label = f"{result['name']} ({result['language']})" if result["name"] else "linha ignorada"
+        report(f"❌ {label}: {result['error']}")
+    _prepare_shared_work(plans)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(slots,)) as pool:
+        futures = [pool.submit(provision_project, row, git_commit, plan) for row, plan in planned]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            stages = " ".join(f"{name}={secs:.2f}s" for name, secs in result["timings"].items())
+            conflicts = result["files"].get("conflicts")
+            if result["error"]:
+                report(f"❌ {result['name']} ({result['language']}): {result['error']}")
+            elif conflicts:
+                report(f"⚠️ {result['name']} ({result['language']}) em {result['seconds']:.2f}s  {stages}  "
+                       f"preservados: {', '.join(conflicts)}")
+            else:
+                report(f"✅ {result['name']} ({result['language']}) em {result['seconds']:.2f}s  {stages}")
+    
+    elapsed = time.perf_counter() - start
+    failures = sum(1 for r in results if r["error"])
+    report(f"\n{len(results)} projetos em {elapsed:.2f}s "
+           f"({len(results) / elapsed if elapsed else 0:.2f} projetos/s), {failures} falha(s)")
+    return results
+
+def cmd_batch(args):
+    load_template_registry()
+    projects = load_manifest(args.manifest)
+    results = run_batch(projects, workers=args.workers, max_subprocesses=args.max_subprocesses,
+                        git_commit=args.commit)
+    return 1 if any(r["error"] for r in results) else 0
+
+def cmd_pack(args):
+    source = Path(args.template_dir)
+    output = Path(args.output) if args.output else source.with_suffix(".abpack")
+    start = time.perf_counter()
+    count = pack_template(source, output)
+    print(f"📦 {count} arquivo(s) empacotados em {output} ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+def build_cli_parser():
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="abridor_ambiente",
+                                     description="Abridor de Ambiente de Estudo (sem argumentos abre a interface gráfica)")
+    commands = parser.add_subparsers(dest="command")
+    
+    batch = commands.add_parser("batch", help="cria vários projetos a partir de um manifesto JSON/CSV")
+    batch.add_argument("manifest", help="arquivo com as colunas language, name, base_dir")
+    batch.add_argument("--workers", type=int, default=None, help="processos em paralelo (padrão: nº de CPUs)")
+    batch.add_argument("--max-subprocesses", type=int, default=4,
+                       help="limite de subprocessos simultâneos (git, venv) em todo o lote")
+    batch.add_argument("--commit", action="store_true", help="faz o commit inicial de cada projeto")
+    batch.set_defaults(handler=cmd_batch)
+    
+    pack = commands.add_parser("pack", help="empacota uma pasta de template em .abpack (templates grandes)")
+    pack.add_argument("template_dir", help="pasta com template.json e files/")
+    pack.add_argument("-o", "--output", help="arquivo de saída (padrão: <pasta>.abpack)")
+    pack.set_defaults(handler=cmd_pack)
+    
+    daemon = commands.add_parser("daemon", help="mantém um processo residente (socket Unix) para criar projetos na hora")
+    daemon.add_argument("--workers", type=int, default=4, help="pedidos atendidos ao mesmo tempo")
+    daemon.add_argument("--stop", action="store_true", help="encerra o daemon em execução")
+    daemon.set_defaults(handler=cmd_daemon)
+    
+    create = commands.add_parser("create", help="cria um projeto (pelo daemon, se estiver rodando)")
+    create.add_argument("language", help="linguagem, ex.: Python")
+    create.add_argument("name", help="nome do projeto")
+    create.add_argument("--base-dir", help="pasta de projetos (padrão: a da configuração)")
+    create.add_argument("--no-editor", action="store_true", help="não abre o VS Code")
+    create.add_argument("--no-browser", action="store_true", help="não abre a documentação")
+    create.add_argument("--no-terminal", action="store_true", help="não abre o terminal")
+    create.add_argument("--no-git", action="store_true", help="não inicializa o Git")
+    create.add_argument("--commit", action="store_true", help="faz o commit inicial")
+    create.add_argument("--no-daemon", action="store_true", help="executa neste processo, sem o daemon")
+    create.add_argument("--dry-run", action="store_true",
+                        help="só mostra o plano (arquivos, comandos, caches) e o tempo estimado")
+    create.add_argument("--json-events", action="store_true",
+                        help="escreve os eventos de progresso como linhas JSON (para outras ferramentas)")
+    create.set_defaults(handler=cmd_create)
+    
+    recent = commands.add_parser("recent", help="lista os projetos recentes (com busca)")
+    recent.add_argument("query", nargs="?", help="trecho do nome, caminho ou linguagem")
+    recent.add_argument("--limit", type=int, default=20, help="quantidade máxima de projetos")
+    recent.set_defaults(handler=cmd_recent)
+    
+    reopen = commands.add_parser("reopen", help="reabre um projeto (só editor, documentação e terminal)")
+    reopen.add_argument("project", help="nome ou caminho do projeto")
+    reopen.add_argument("--no-editor", action="store_true", help="não abre o VS Code")
+    reopen.add_argument("--no-browser", action="store_true", help="não abre a documentação")
+    reopen.add_argument("--no-terminal", action="store_true", help="não abre o terminal")
+    reopen.add_argument("--no-daemon", action="store_true", help="executa neste processo, sem o daemon")
+    reopen.add_argument("--json-events", action="store_true", help="escreve os eventos como linhas JSON")
+    reopen.set_defaults(handler=cmd_reopen)
+    
+    docs = commands.add_parser("docs", help="espelho local da documentação (mirror, import, status, serve)")
+    docs.add_argument("action", choices=["mirror", "import", "status", "serve"])
+    docs.add_argument("targets", nargs="*", help="linguagens (mirror/status) ou arquivos (import)")
+    docs.set_defaults(handler=cmd_docs)
+    
+    du = commands.add_parser("du", help="uso de disco dos projetos; arquiva ou remove os parados")
+    du.add_argument("--root", help="pasta de projetos (padrão: a da configuração)")
+    du.add_argument("--limit", type=int, default=30, help="quantos projetos listar (os maiores)")
+    du.add_argument("--workers", type=int, default=8, help="threads de varredura")
+    du.add_argument("--idle-days", type=float, help="seleciona projetos sem modificação há mais de N dias")
+    du.add_argument("--archive", metavar="PASTA", help="compacta os selecionados em tar.gz (sem o venv) e os remove")
+    du.add_argument("--remove", action="store_true", help="remove os selecionados sem arquivar")
+    du.add_argument("--processes", type=int, default=None, help="processos para compactar (padrão: nº de CPUs)")
+    du.set_defaults(handler=cmd_du)
+    
+    return parser
 
 # ==================== EXECUÇÃO ====================
 
-if __name__ == "__main__":
+def run_gui():
+    mark_resident_process()
+    load_template_registry()
+    load_tkinter()
     root = tk.Tk()
     app = DevEnvironmentLauncher(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run_gui()
+        return 0
+    
+    args = build_cli_parser().parse_args(argv)
+    if not getattr(args, "handler", None):
+        build_cli_parser().print_help()
+        return 2
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,493 @@
+"""Benchmarks do Abridor de Ambiente
+
+Uso:
+    python bench_abridor.py run [--only scaffold,launch,...] [--runs N] [--output resultado.json]
+    python bench_abridor.py compare base.json novo.json [--threshold 0.10]
+
+Benchmarks disponíveis: scaffold, launch, import, first_paint, batch, pack, daemon, du, venv.
+O 'venv' cria venvs de verdade e por isso só roda quando pedido em --only.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import abridor_ambiente as app
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BENCHMARKS = ["scaffold", "launch", "import", "first_paint", "batch", "pack", "daemon", "du"]
+BATCH_SIZES = [1, 10, 100, 1000]
+
+# ==================== UTILITÁRIOS ====================
+
+def timed(func, *args, **kwargs):
+    """Executa a função e retorna o tempo gasto em segundos"""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def summarize(samples):
+    """Resumo estatístico de uma lista de tempos"""
+    return {
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+@contextlib.contextmanager
+def isolated_cache():
+    """Usa uma pasta de cache temporária para não depender do estado da máquina"""
+    previous = dict(app.CONFIG)
+    with tempfile.TemporaryDirectory(prefix="abridor_cache_") as tmp:
+        app.CONFIG["cache_dir"] = tmp
+        try:
+            yield Path(tmp)
+        finally:
+            app.CONFIG.clear()
+            app.CONFIG.update(previous)
+
+class FakeProcess:
+    """Substituto instantâneo de subprocess.Popen"""
+
+    def __init__(self, cmd, *args, **kwargs):
+        self.args = cmd
+        self.returncode = 0
+        self.pid = 0
+        self.stdout = self.stderr = None
+
+    def poll(self):
+        return 0
+
+    def wait(self, timeout=None):
+        return 0
+
+    def communicate(self, input=None, timeout=None):
+        return "", ""
+
+def fake_run(cmd, *args, **kwargs):
+    """Substituto instantâneo de subprocess.run"""
+    text = kwargs.get("text") or kwargs.get("universal_newlines")
+    empty = "" if text else b""
+    return subprocess.CompletedProcess(cmd, 0, stdout=empty, stderr=empty)
+
+@contextlib.contextmanager
+def stubbed_side_effects():
+    """Troca subprocessos e navegador por stubs locais e rápidos"""
+    originals = (app.subprocess.run, app.subprocess.Popen, webbrowser.open)
+    app.subprocess.run, app.subprocess.Popen = fake_run, FakeProcess
+    webbrowser.open = lambda url, *args, **kwargs: True
+    try:
+        yield
+    finally:
+        app.subprocess.run, app.subprocess.Popen, webbrowser.open = originals
+
+def filesystem_type(path):
+    """Tipo do sistema de arquivos que contém 'path' (Linux; None se não der para saber)"""
+    path = os.path.realpath(path)
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return None
+    best, fs_type = "", None
+    for mount_point, kind in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        inside = path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) > len(best):
+            best, fs_type = mount_point, kind
+    return fs_type
+
+def disk_dirs(tmpfs_dir, disk_dir):
+    """Pastas usadas nos testes de lote (memória e disco)"""
+    dirs = {}
+    if tmpfs_dir and Path(tmpfs_dir).is_dir():
+        dirs["tmpfs"] = Path(tmpfs_dir)
+    dirs["disk"] = Path(disk_dir)
+    fs_type = filesystem_type(disk_dir)
+    if fs_type in ("tmpfs", "ramfs"):
+        print(f"Aviso: --disk-dir {disk_dir} está em {fs_type}; o resultado 'disk' não mede o disco",
+              file=sys.stderr)
+    return dirs
+
+# ==================== BENCHMARKS ====================
+
+def bench_scaffold(args):
+    """create_project_structure para cada linguagem: projeto novo e reexecução"""
+    result = {}
+    with isolated_cache(), tempfile.TemporaryDirectory(prefix="abridor_bench_") as tmp:
+        for index, language in enumerate(app.LANGUAGES):
+            fresh, rerun = [], []
+            for run in range(args.runs):
+                name = f"p{index}_{run}"
+                fresh.append(timed(app.create_project_structure, language, name, tmp))
+                rerun.append(timed(app.create_project_structure, language, name, tmp))
+            result[language] = {"fresh": summarize(fresh), "rerun": summarize(rerun)}
+    return result
+
+def bench_launch(args):
+    """Pipeline completo (grafo de etapas) com subprocessos e navegador simulados"""
+    result = {}
+    with isolated_cache(), stubbed_side_effects(), tempfile.TemporaryDirectory(prefix="abridor_bench_") as tmp:
+        app.CONFIG["vscode_path"] = "code"
+        app.CONFIG["venv_pool_size"] = 0
+        app.CONFIG["warm_build"] = False  # compila de verdade (ferramentas reais), fora do escopo
+        app.CONFIG["docs_mirror"] = False  # baixaria as páginas da internet em segundo plano
+        for index, language in enumerate(app.LANGUAGES):
+            samples = []
+            for run in range(args.runs):
+                stages = app.build_launch_stages(language, f"l{index}_{run}", tmp)
+                start = time.perf_counter()
+                _, errors = app.run_stage_graph(stages)
+                samples.append(time.perf_counter() - start)
+                failures = {name: str(e) for name, e in errors.items() if e is not None}
+                if failures:
+                    raise RuntimeError(f"falha no pipeline de {language}: {failures}")
+            result[language] = summarize(samples)
+    return result
+
+def bench_import(args):
+    """Tempo para importar o módulo em um interpretador novo (descontando o próprio interpretador)"""
+    def run(code):
+        return timed(subprocess.run, [sys.executable, "-c", code], cwd=HERE, check=True)
+
+    baseline = [run("pass") for _ in range(args.runs)]
+    module = [run("import abridor_ambiente") for _ in range(args.runs)]
+    return {
+        "interpreter": summarize(baseline),
+        "module": summarize(module),
+        "module_only_median": statistics.median(module) - statistics.median(baseline),
+    }
+
+FIRST_PAINT_CHILD = """
+import sys
+import abridor_ambiente as app
+app.load_tkinter()
+root = app.tk.Tk()
+launcher = app.DevEnvironmentLauncher(root)
+root.update()
+print("painted", flush=True)
+root.destroy()
+"""
+
+def bench_first_paint(args):
+    """Do início do processo até a janela do DevEnvironmentLauncher ser desenhada"""
+    if os.name != "nt" and sys.platform != "darwin" and not os.environ.get("DISPLAY"):
+        return {"skipped": "sem DISPLAY (use xvfb-run para medir)"}
+
+    samples = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        child = subprocess.Popen([sys.executable, "-c", FIRST_PAINT_CHILD], cwd=HERE,
+                                 stdout=subprocess.PIPE, text=True)
+        line = child.stdout.readline()
+        elapsed = time.perf_counter() - start
+        child.wait(timeout=30)
+        if line.strip() != "painted":
+            return {"skipped": f"janela não foi criada (código {child.returncode})"}
+        samples.append(elapsed)
+    return summarize(samples)
+
+def bench_batch(args):
+    """Modo lote com 1, 10, 100 e 1000 projetos, em tmpfs e em disco"""
+    languages = [lang for lang, cfg in app.LANGUAGES.items() if args.with_venv or not cfg.get("venv")]
+    result = {}
+    for label, parent in disk_dirs(args.tmpfs_dir, args.disk_dir).items():
+        parent.mkdir(parents=True, exist_ok=True)
+        result[label] = {}
+        for size in args.sizes:
+            with isolated_cache(), tempfile.TemporaryDirectory(prefix="abridor_batch_", dir=parent) as tmp:
+                projects = [{"language": languages[i % len(languages)], "name": f"b{i}",
+                             "base_dir": tmp, "git": True} for i in range(size)]
+                start = time.perf_counter()
+                results = app.run_batch(projects, workers=args.workers, report=lambda *a: None)
+                elapsed = time.perf_counter() - start
+            failures = [r for r in results if r["error"]]
+            result[label][str(size)] = {
+                "seconds": elapsed,
+                "projects_per_s": size / elapsed if elapsed else 0.0,
+                "failures": len(failures),
+            }
+    return result
+
+def bench_pack(args):
+    """Extração de um template .abpack com muitos arquivos (semente sintética)"""
+    with isolated_cache(), tempfile.TemporaryDirectory(prefix="abridor_pack_") as tmp:
+        tmp = Path(tmp)
+        seed = tmp / "seed"
+        (seed / "files").mkdir(parents=True)
+        (seed / "template.json").write_text(json.dumps({"name": "Seed"}), encoding="utf-8")
+        for i in range(args.pack_files):
+            folder = seed / "files" / f"d{i % 100}"
+            folder.mkdir(exist_ok=True)
+            (folder / f"f{i}.txt").write_bytes(os.urandom(i % 4096))
+
+        pack = tmp / "seed.abpack"
+        pack_s = timed(app.pack_template, seed, pack)
+
+        fresh, rerun = [], []
+        for run in range(args.runs):
+            target = tmp / f"project_{run}"
+            fresh.append(timed(app.materialize_pack, pack, target, {}))
+            manifest = app.load_project_manifest(target)  # vazio: a reexecução compara hashes
+            rerun.append(timed(app.materialize_pack, pack, target, manifest))
+    return {"files": args.pack_files, "pack_seconds": pack_s,
+            "materialize": summarize(fresh), "rerun": summarize(rerun)}
+
+DAEMON_CHILD = """
+import sys
+import abridor_ambiente as app
+app.CONFIG["venv_pool_size"] = int(sys.argv[1])
+sys.exit(app.main(["daemon"]))
+"""
+
+def wait_for_daemon(path, timeout=30):
+    """Espera o daemon começar a aceitar conexões"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if app.daemon_alive(path):
+            return True
+        time.sleep(0.05)
+    return False
+
+def daemon_ready(request, path):
+    """Envia o pedido ao daemon; retorna o tempo até o evento "ready" (lê até o fim)"""
+    start = time.perf_counter()
+    ready = None
+    for event in app.daemon_request(request, path):
+        if event["event"] == "ready":
+            ready = time.perf_counter() - start
+        elif event["event"] == "finished" and not event["ok"]:
+            raise RuntimeError(f"falha no daemon: {event['errors']}")
+    return ready
+
+def bench_daemon(args):
+    """Até o "pronto": execução a frio (processo novo) x cliente do daemon x pedido direto ao socket"""
+    if os.name == "nt":
+        return {"skipped": "sockets Unix indisponíveis"}
+
+    languages = [lang for lang, cfg in app.LANGUAGES.items() if args.with_venv or not cfg.get("venv")]
+    flags = ["--no-editor", "--no-browser", "--no-terminal"]
+    script = str(HERE / "abridor_ambiente.py")
+    with tempfile.TemporaryDirectory(prefix="abridor_daemon_") as tmp:
+        tmp = Path(tmp)
+        env = dict(os.environ, HOME=str(tmp), USERPROFILE=str(tmp))
+        projects = tmp / "projetos"
+        path = tmp / ".abridor_ambiente" / app.DAEMON_SOCKET
+
+        def create(name, language, *extra):
+            cmd = [sys.executable, script, "create", language, name, "--base-dir", str(projects)]
+            return timed(subprocess.run, cmd + flags + list(extra), env=env, check=True,
+                         stdout=subprocess.DEVNULL)
+
+        cold = [create(f"c{i}", languages[i % len(languages)], "--no-daemon") for i in range(args.runs)]
+
+        daemon = subprocess.Popen([sys.executable, "-c", DAEMON_CHILD, "2" if args.with_venv else "0"],
+                                  cwd=HERE, env=env, stdout=subprocess.DEVNULL)
+        try:
+            if not wait_for_daemon(path):
+                return {"skipped": "o daemon não iniciou"}
+            client = [create(f"d{i}", languages[i % len(languages)]) for i in range(args.runs)]
+
+            def request(name, language):
+                return {"op": "create", "language": language, "name": name, "base_dir": str(projects),
+                        "options": {"editor": False, "browser": False, "terminal": False}}
+
+            direct = [daemon_ready(request(f"r{i}", languages[i % len(languages)]), path)
+                      for i in range(args.runs)]
+
+            # Pedidos simultâneos: o daemon atende em um pool limitado de threads
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                start = time.perf_counter()
+                list(pool.map(lambda i: daemon_ready(request(f"s{i}", languages[i % len(languages)]), path),
+                              range(8)))
+                concurrent = time.perf_counter() - start
+        finally:
+            for _ in app.daemon_request({"op": "shutdown"}, path):
+                pass
+            daemon.wait(timeout=30)
+
+    result = {"cold_process": summarize(cold), "daemon_process": summarize(client),
+              "daemon_request": summarize(direct), "concurrent_8_seconds": concurrent}
+    result["speedup"] = result["cold_process"]["median"] / max(result["daemon_request"]["median"], 1e-9)
+    return result
+
+def bench_du(args):
+    """Varredura de uso de disco (arquivos/s) e arquivamento em tar.gz (MB/s)"""
+    with isolated_cache(), tempfile.TemporaryDirectory(prefix="abridor_du_") as tmp:
+        root = Path(tmp) / "projetos"
+        projects = 50
+        for i in range(args.du_files):
+            folder = root / f"p{i % projects}" / f"d{i % 37}"
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / f"f{i}.txt").write_bytes(b"x" * (i % 8192))
+        for i in range(projects):
+            (root / f"p{i}" / "main.cpp").touch()
+            (root / f"p{i}" / "Makefile").touch()
+
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            scanned = app.scan_projects(root, workers=args.workers or 8)
+            samples.append(time.perf_counter() - start)
+        files = sum(p["files"] for p in scanned)
+        total_mb = sum(p["bytes"] for p in scanned) / (1024 * 1024)
+
+        start = time.perf_counter()
+        results = app.archive_idle_projects(scanned, -1, archive_dir=Path(tmp) / "arquivo", workers=args.workers)
+        archive_s = time.perf_counter() - start
+        if any(error for _, _, error in results):
+            raise RuntimeError(f"falha ao arquivar: {[r for r in results if r[2]]}")
+
+    scan = summarize(samples)
+    scan["files_per_s"] = files / scan["median"] if scan["median"] else 0.0
+    return {"files": files, "scan": scan,
+            "archive": {"seconds": archive_s, "mb_per_s": total_mb / archive_s if archive_s else 0.0}}
+
+def bench_venv(args):
+    """Compara a criação de venv do zero com a entrega de um venv do pool"""
+    runs = args.runs
+    with tempfile.TemporaryDirectory(prefix="abridor_bench_") as tmp:
+        tmp = Path(tmp)
+        pool = app.VenvPool(root=tmp / "pool", size=runs)
+
+        fresh = [timed(app.create_fresh_venv, tmp / f"fresh_{i}") for i in range(runs)]
+
+        pool.fill()  # pré-aquecimento fora da medição, como acontece em segundo plano
+        pooled = []
+        for i in range(runs):
+            dest = tmp / f"pooled_{i}"
+            start = time.perf_counter()
+            if not pool.acquire(dest):
+                raise RuntimeError("pool vazio durante o benchmark")
+            pooled.append(time.perf_counter() - start)
+
+        shutil.rmtree(tmp / "pool", ignore_errors=True)
+
+    result = {"fresh": summarize(fresh), "pooled": summarize(pooled)}
+    result["speedup"] = result["fresh"]["median"] / max(result["pooled"]["median"], 1e-9)
+    return result
+
+BENCHMARKS = {
+    "scaffold": bench_scaffold,
+    "launch": bench_launch,
+    "import": bench_import,
+    "first_paint": bench_first_paint,
+    "batch": bench_batch,
+    "pack": bench_pack,
+    "daemon": bench_daemon,
+    "du": bench_du,
+    "venv": bench_venv,
+}
+
+# ==================== COMPARAÇÃO ====================
+
+# Métricas em que um valor maior é melhor; as demais são tempos
+HIGHER_IS_BETTER = ("projects_per_s", "speedup", "files_per_s", "mb_per_s")
+COMPARED_KEYS = ("median", "seconds", "module_only_median") + HIGHER_IS_BETTER
+
+def flatten(data, prefix=""):
+    """Achata o JSON de resultados em {"benchmark.caso.métrica": valor}"""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and key in COMPARED_KEYS:
+            flat[path] = value
+    return flat
+
+def compare(base, new, threshold):
+    """Lista as métricas que pioraram mais que 'threshold' (fração)"""
+    base_flat, new_flat = flatten(base["results"]), flatten(new["results"])
+    regressions = []
+    for key in sorted(base_flat.keys() & new_flat.keys()):
+        old, cur = base_flat[key], new_flat[key]
+        if old <= 0 or cur <= 0:
+            continue
+        change = (old / cur - 1) if key.endswith(HIGHER_IS_BETTER) else (cur / old - 1)
+        status = "REGRESSÃO" if change > threshold else "ok"
+        print(f"{status:>9}  {key:<55} {old:>10.4f} -> {cur:>10.4f}  ({change:+.1%})")
+        if change > threshold:
+            regressions.append(key)
+    return regressions
+
+# ==================== EXECUÇÃO ====================
+
+def cmd_run(args):
+    names = args.only.split(",") if args.only else DEFAULT_BENCHMARKS
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Benchmarks desconhecidos: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = {}
+    for name in names:
+        print(f"▶ {name}...", file=sys.stderr)
+        results[name] = BENCHMARKS[name](args)
+
+    output = {
+        "meta": {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "runs": args.runs,
+        },
+        "results": results,
+    }
+    text = json.dumps(output, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+    return 0
+
+def cmd_compare(args):
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    regressions = compare(base, new, args.threshold)
+    print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do Abridor de Ambiente")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="executa os benchmarks e grava o resultado em JSON")
+    run.add_argument("--only", help=f"lista separada por vírgulas ({', '.join(BENCHMARKS)})")
+    run.add_argument("--runs", type=int, default=3, help="repetições por medição")
+    run.add_argument("--output", help="arquivo JSON de saída")
+    run.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")], default=BATCH_SIZES,
+                     help="tamanhos do lote (padrão: 1,10,100,1000)")
+    run.add_argument("--workers", type=int, default=None, help="processos do modo lote")
+    run.add_argument("--tmpfs-dir", default="/dev/shm", help="pasta em memória para o lote")
+    # Não usa o diretório temporário do sistema: em muitas distribuições /tmp é tmpfs
+    run.add_argument("--disk-dir", default=str(Path.home() / ".abridor_ambiente" / "bench"),
+                     help="pasta em disco para o lote (padrão: ~/.abridor_ambiente/bench)")
+    run.add_argument("--with-venv", action="store_true", help="inclui projetos Python (com venv) no lote")
+    run.add_argument("--pack-files", type=int, default=10000, help="arquivos da semente do benchmark 'pack'")
+    run.add_argument("--du-files", type=int, default=20000, help="arquivos da árvore do benchmark 'du'")
+    run.set_defaults(handler=cmd_run)
+
+    cmp_parser = commands.add_parser("compare", help="compara dois resultados e aponta regressões")
+    cmp_parser.add_argument("base")
+    cmp_parser.add_argument("new")
+    cmp_parser.add_argument("--threshold", type=float, default=0.10, help="piora tolerada (padrão: 0.10)")
+    cmp_parser.set_defaults(handler=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
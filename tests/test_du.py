@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import abridor_ambiente as app
+
+
+class ArchiveIdleProjectsTest(unittest.TestCase):
+    """du --idle-days N --remove/--archive só toca projetos criados pelo Abridor"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "Projetos"
+        self.root.mkdir()
+        app.CONFIG["cache_dir"] = str(Path(self.tmp.name) / "cache")
+        old = time.time() - 90 * 86400
+
+        # Pasta do usuário com os mesmos arquivos do template Python, sem manifesto
+        self.user_dir = self.root / "meu_script"
+        self.user_dir.mkdir()
+        for name in ("main.py", "requirements.txt"):
+            (self.user_dir / name).write_text("# do usuário\n", encoding='utf-8')
+
+        # Projeto criado pelo Abridor
+        self.project = Path(app.create_project_structure("Python", "criado", self.root))
+
+        for folder in (self.user_dir, self.project):
+            for path in [folder] + list(folder.rglob("*")):
+                os.utime(path, (old, old))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_remove_keeps_folders_without_manifest(self):
+        projects = app.scan_projects(self.root, workers=2)
+        self.assertEqual({p["name"]: p["language"] for p in projects},
+                         {"meu_script": "Python", "criado": "Python"})
+
+        results = app.archive_idle_projects(projects, idle_days=30, workers=1)
+
+        self.assertEqual([(path, error) for path, _, error in results], [(str(self.project), None)])
+        self.assertFalse(self.project.exists())
+        self.assertTrue((self.user_dir / "main.py").exists())
+
+    def test_archive_project_refuses_unmanaged_folder(self):
+        with self.assertRaises(Exception):
+            app.archive_project(self.user_dir, Path(self.tmp.name) / "arquivo")
+        self.assertTrue((self.user_dir / "main.py").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import abridor_ambiente as app
+
+
+def rewrite_index(pack, change):
+    """Regrava o índice do pacote depois de 'change(index)'"""
+    data = pack.read_bytes()
+    size = int.from_bytes(data[-16:-8], "little")
+    index = json.loads(data[-16 - size:-16].decode('utf-8'))
+    change(index)
+    raw = json.dumps(index).encode('utf-8')
+    pack.write_bytes(data[:-16 - size] + raw + len(raw).to_bytes(8, "little") + app.PACK_MAGIC)
+
+
+class MaterializePackTest(unittest.TestCase):
+    """Pacotes corrompidos falham com erro, sem travar a extração"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        source = root / "semente"
+        (source / app.TEMPLATE_FILES_DIR).mkdir(parents=True)
+        (source / app.TEMPLATE_META).write_text(json.dumps({"name": "Semente"}), encoding='utf-8')
+        (source / app.TEMPLATE_FILES_DIR / "a.txt").write_text("conteúdo\n", encoding='utf-8')
+        self.pack = root / "semente.abpack"
+        app.pack_template(source, self.pack)
+        self.project = root / "projeto"
+        self.project.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_extracts_valid_pack(self):
+        report = app.materialize_pack(self.pack, self.project, {})
+        self.assertEqual(report["created"], ["a.txt"])
+        self.assertEqual((self.project / "a.txt").read_text(encoding='utf-8'), "conteúdo\n")
+
+    def test_oversized_entry_is_rejected(self):
+        def grow(index):
+            index["files"][0]["size"] = 1 << 20
+        rewrite_index(self.pack, grow)
+        with self.assertRaises(Exception):
+            app.materialize_pack(self.pack, self.project, {})
+        self.assertFalse((self.project / "a.txt").exists())
+
+    def test_digest_mismatch_is_rejected(self):
+        def corrupt(index):
+            index["files"][0]["sha256"] = "0" * 64
+        rewrite_index(self.pack, corrupt)
+        with self.assertRaises(Exception):
+            app.materialize_pack(self.pack, self.project, {})
+        self.assertFalse((self.project / "a.txt").exists())
+
+    def test_short_copy_raises(self):
+        import mmap
+        with open(self.pack, "rb") as src, open(self.project / "b.txt", "wb") as dst:
+            src_map = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                with self.assertRaises(Exception):
+                    app._copy_range(src.fileno(), src_map, dst.fileno(), os.path.getsize(self.pack) - 4,
+                                    100, {})
+            finally:
+                src_map.close()
+
+
+if __name__ == "__main__":
+    unittest.main()